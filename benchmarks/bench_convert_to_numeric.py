@@ -0,0 +1,107 @@
+"""Benchmark convert_to_numeric on a full financial sheet"""
+
+import argparse
+import random
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from otld.utils.MockData import MockData
+from otld.utils.pandas_utils import convert_to_numeric
+from otld.utils.string_utils import make_negative_string
+
+
+def convert_to_numeric_elementwise(
+    series: pd.Series, numeric_type: type = float
+) -> pd.Series:
+    """Element-wise implementation of convert_to_numeric, kept as a baseline
+
+    Includes the pass replacing "-" placeholders with 0 that append_1997_2009 used
+    to run before converting.
+
+    Args:
+        series (pd.Series): Pandas series to convert to integer type.
+
+    Returns:
+        pd.Series: Series converted to type int.
+    """
+    series = series.map(lambda x: 0 if type(x) is str and x.strip() == "-" else x)
+    series = series.map(lambda x: (make_negative_string(x) if type(x) is str else x))
+    series = series.astype(numeric_type)
+    series = series.map(lambda x: round(x) if not np.isnan(x) else x)
+
+    return series
+
+
+def format_value(value):
+    """Format a value as it may appear in a raw financial workbook"""
+    if not isinstance(value, int):
+        # Empty cells are read as missing
+        return None
+
+    choice = random.random()
+    if choice < 0.25:
+        return f"{value:,}"
+    elif choice < 0.35:
+        return f"({value:,})"
+    elif choice < 0.4:
+        return "-"
+
+    return value
+
+
+def financial_sheet(year: int = 2024) -> pd.DataFrame:
+    """Mock a full financial sheet with text formatted values
+
+    Args:
+        year (int, optional): Fiscal year to mock. Defaults to 2024.
+
+    Returns:
+        pd.DataFrame: Financial data indexed by state.
+    """
+    workbook = next(
+        iter(MockData("financial", year).generate_data().workbooks.values())
+    )
+    rows = list(workbook.active.values)
+    df = pd.DataFrame(rows[1:], columns=rows[0]).set_index("State")
+
+    return df.map(format_value)
+
+
+def main():
+    """Time both implementations and report the speedup"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-n", "--number", type=int, default=20, help="Conversions per repeat."
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of repeats."
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    df = financial_sheet()
+
+    # Both implementations must agree before timing them
+    pd.testing.assert_frame_equal(
+        df.apply(convert_to_numeric_elementwise), convert_to_numeric(df)
+    )
+
+    print(f"Financial sheet: {df.shape[0]} rows x {df.shape[1]} columns")
+    timings = {}
+    for name, function in [
+        ("element-wise", lambda: df.apply(convert_to_numeric_elementwise)),
+        ("vectorized", lambda: convert_to_numeric(df)),
+    ]:
+        timings[name] = min(
+            timeit.repeat(function, number=args.number, repeat=args.repeat)
+        )
+        timings[name] /= args.number
+        print(f"{name:>12}: {timings[name] * 1000:.2f} ms per sheet")
+
+    print(f"     speedup: {timings['element-wise'] / timings['vectorized']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""Benchmark the financial append and Tableau pipelines on mock data
+
+Synthetic inputs are generated with MockData at a configurable scale (years x states
+x categories). Each stage of tanf-append (reading the history, parsing the sheets to
+append, cleaning, concatenation, melt and export) is timed in isolation through the
+functions tanf-append itself calls, followed by end-to-end runs of tanf-append and
+tanf-tableau. Wall time and peak memory for every stage are appended to a JSON history
+so that results can be compared across commits.
+
+combine_appended_files.main and format_appended_files.main read intermediate files
+from fixed data directories that cannot be mocked, so they are not run end to end;
+the clean, melt and export stages they share with tanf-append are covered above.
+
+Usage:
+    python benchmarks/bench_pipeline.py --years 20 --states 30 --categories 40
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import openpyxl as opxl
+import pandas as pd
+
+from otld.append.TANFData import TANFData, read_worksheet
+from otld.tableau.TableauDatasets import TableauDatasets
+from otld.utils import export_workbook, long_notes
+from otld.utils.MockData import FINANCIAL_COLUMNS, MockData
+from otld.utils.reshape_utils import wide_to_long
+from otld.utils.schema import apply_long_schema
+from otld.utils.states import STATES
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+HISTORY = os.path.join(os.path.dirname(__file__), "history.json")
+PCE = os.path.join(ROOT, "data", "misc", "pce.csv")
+
+
+def scale_workbook(
+    workbook: opxl.Workbook, states: list[str], categories: int, skip_cols: int
+) -> opxl.Workbook:
+    """Restrict a mocked workbook to a subset of states and categories
+
+    Args:
+        workbook (opxl.Workbook): Workbook generated by MockData.
+        states (list[str]): States to keep. U.S. Total is always kept.
+        categories (int): Number of category columns to keep.
+        skip_cols (int): Number of leading index columns (state, year).
+
+    Returns:
+        opxl.Workbook: Scaled workbook.
+    """
+    scaled = opxl.Workbook()
+    scaled.remove(scaled.active)
+    for ws in workbook.worksheets:
+        new_ws = scaled.create_sheet(ws.title)
+        for i, row in enumerate(ws.values):
+            if i == 0 or row[0] in states or row[0] == "U.S. Total":
+                new_ws.append(row[: skip_cols + categories])
+
+    return scaled
+
+
+def generate_inputs(directory: str, years: int, states: int, categories: int):
+    """Mock an appended history and a raw workbook for the following year
+
+    Args:
+        directory (str): Directory in which to save the mocked workbooks.
+        years (int): Number of fiscal years in the appended history.
+        states (int): Number of states to include.
+        categories (int): Number of financial categories to include.
+
+    Returns:
+        tuple[str, str]: Paths to the appended workbook and the workbook to append.
+    """
+    year = 2024
+    selected = [state for state in STATES if state != "U.S. Total"][:states]
+
+    appended = MockData("financial", list(range(year - years, year)), appended=True)
+    appended.generate_data()
+    appended_path = os.path.join(directory, "FinancialDataWide.xlsx")
+    scale_workbook(
+        appended.workbooks["FinancialDataWide.xlsx"], selected, categories, 2
+    ).save(appended_path)
+
+    to_append = MockData("financial", year).generate_data()
+    to_append_path = os.path.join(directory, f"tanf_financial_data_fy_{year}.xlsx")
+    scale_workbook(
+        to_append.workbooks[f"tanf_financial_data_fy_{year}.xlsx"],
+        selected,
+        categories,
+        1,
+    ).save(to_append_path)
+
+    return appended_path, to_append_path
+
+
+class Pipeline:
+    """Stages of tanf-append for financial data, run one at a time
+
+    Each stage calls the methods TANFData.append runs for every level, so that the
+    stages time the production code.
+    """
+
+    def __init__(self, appended_path: str, to_append_path: str, out_dir: str):
+        self._tanf = TANFData("financial", appended_path, to_append_path)
+        self._out_dir = out_dir
+
+        self._sheets = {}
+        for level in self._tanf.sheet_dict["financial"]:
+            self._tanf._level = level
+            self._tanf.get_worksheets()
+            self._sheets[level] = self._tanf._sheets
+
+    def base(self) -> dict[pd.DataFrame]:
+        """Read the appended history from the Excel workbook"""
+        base = {}
+        for level in self._sheets:
+            self._tanf._level = level
+            base[level] = self._tanf.get_base()
+
+        return base
+
+    def parse(self) -> dict[pd.DataFrame]:
+        """Read the sheets to append, detect headers and convert values to numbers"""
+        _, workbook = self._tanf.workbook("Total")
+        return {
+            level: read_worksheet("financial", workbook, sheet)
+            for level, sheet in self._sheets.items()
+        }
+
+    def clean(self, parsed: dict[pd.DataFrame]) -> dict[pd.DataFrame]:
+        """Add the fiscal year to the index, rename columns and validate"""
+        frames = {}
+        for level, sheet in self._sheets.items():
+            # Parsed worksheets are collected by get_df as if parsed concurrently
+            self._tanf._parsed[(level, sheet)] = parsed[level].copy()
+            self._tanf._level = level
+            self._tanf._sheets = sheet
+            self._tanf.get_df()
+            frames[level] = self._tanf._df
+
+        return frames
+
+    def concat(
+        self, frames: dict[pd.DataFrame], base: dict[pd.DataFrame]
+    ) -> dict[pd.DataFrame]:
+        """Append the new data to the history"""
+        return {level: pd.concat([base[level], df]) for level, df in frames.items()}
+
+    def melt(self, frames: dict[pd.DataFrame]) -> dict[pd.DataFrame]:
+        """Reshape the appended data long"""
+        return {"FinancialData": apply_long_schema(wide_to_long(frames, "Amount"))}
+
+    def export(self, wide: dict[pd.DataFrame], long: dict[pd.DataFrame]) -> None:
+        """Export the wide and long workbooks"""
+        export_workbook(wide, os.path.join(self._out_dir, "FinancialDataWide.xlsx"))
+        export_workbook(
+            long,
+            os.path.join(self._out_dir, "FinancialDataLong.xlsx"),
+            footnotes=long_notes("FinancialData", {}),
+            streaming=True,
+        )
+
+    def close(self):
+        """Close the workbooks held by TANFData"""
+        self._tanf.close_excel_files()
+
+
+def measure(function, repeat: int) -> tuple[dict, object]:
+    """Time a function and record its peak memory
+
+    The function is run once under tracemalloc to record peak memory and capture
+    its result, then `repeat` more times untraced; the fastest run is reported.
+
+    Args:
+        function (Callable): Function to measure. Must be safe to call repeatedly.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        tuple[dict, object]: Measurements and the function's return value.
+    """
+    tracemalloc.start()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+
+    return {"seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2)}, result
+
+
+def run(args: argparse.Namespace, directory: str) -> dict[dict]:
+    """Run all stages and end-to-end pipelines
+
+    Args:
+        args (argparse.Namespace): Command line arguments.
+        directory (str): Working directory for inputs and outputs.
+
+    Returns:
+        dict[dict]: Measurements keyed by stage.
+    """
+    appended_path, to_append_path = generate_inputs(
+        directory, args.years, args.states, args.categories
+    )
+    out_dir = os.path.join(directory, "out")
+    os.makedirs(out_dir)
+
+    stages = {}
+    pipeline = Pipeline(appended_path, to_append_path, out_dir)
+    stages["base"], base = measure(pipeline.base, args.repeat)
+    stages["parse"], parsed = measure(pipeline.parse, args.repeat)
+    stages["clean"], frames = measure(lambda: pipeline.clean(parsed), args.repeat)
+    stages["concat"], wide = measure(lambda: pipeline.concat(frames, base), args.repeat)
+    stages["melt"], long = measure(lambda: pipeline.melt(wide), args.repeat)
+    stages["export"], _ = measure(lambda: pipeline.export(wide, long), args.repeat)
+    pipeline.close()
+
+    def append():
+        tanf_data = TANFData("financial", appended_path, to_append_path)
+        tanf_data.append()
+        tanf_data.close_excel_files()
+
+    def tableau():
+        wide_path = [
+            os.path.join(directory, file)
+            for file in os.listdir(directory)
+            if file.startswith("FinancialDataWide_")
+        ][0]
+        argv = sys.argv
+        sys.argv = ["tanf-tableau", "financial", wide_path, out_dir, "-i", PCE]
+        try:
+            TableauDatasets().generate()
+        finally:
+            sys.argv = argv
+
+    stages["tanf-append"], _ = measure(append, args.repeat)
+    stages["tanf-tableau"], _ = measure(tableau, args.repeat)
+
+    return stages
+
+
+def commit() -> str | None:
+    """Short hash of the current commit, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> list[dict]:
+    """Load the benchmark history, or an empty history if none exists"""
+    if not os.path.exists(path):
+        return []
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def report(record: dict, previous: dict | None) -> None:
+    """Print measurements, and changes relative to a previous run if given"""
+    print(
+        f"{record["scale"]["years"]} years x {record["scale"]["states"]} states x "
+        f"{record["scale"]["categories"]} categories"
+    )
+    print(f"{"stage":>12} {"seconds":>9} {"peak MB":>9} {"change":>8}")
+    for stage, values in record["stages"].items():
+        change = ""
+        if previous and stage in previous["stages"]:
+            before = previous["stages"][stage]["seconds"]
+            if before:
+                change = f"{values["seconds"] / before - 1:+.0%}"
+        print(
+            f"{stage:>12} {values["seconds"]:>9.3f} {values["peak_mb"]:>9.1f} "
+            f"{change:>8}"
+        )
+    if previous:
+        print(f"Change relative to {previous["commit"]} ({previous["timestamp"]})")
+
+
+def main():
+    """Run the benchmark and record the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-y", "--years", type=int, default=10, help="Fiscal years of history."
+    )
+    parser.add_argument(
+        "-s",
+        "--states",
+        type=int,
+        default=len(STATES) - 1,
+        help=f"Number of states, at most {len(STATES) - 1}.",
+    )
+    parser.add_argument(
+        "-c",
+        "--categories",
+        type=int,
+        default=len(FINANCIAL_COLUMNS) - 1,
+        help=f"Number of financial categories, at most {len(FINANCIAL_COLUMNS) - 1}.",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Timed runs per stage."
+    )
+    parser.add_argument(
+        "--history", type=str, default=HISTORY, help="JSON file of past results."
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not record results in history."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        stages = run(args, directory)
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "scale": {
+            "years": args.years,
+            "states": args.states,
+            "categories": args.categories,
+        },
+        "stages": stages,
+    }
+
+    history = load_history(args.history)
+    previous = [entry for entry in history if entry["scale"] == record["scale"]]
+    report(record, previous[-1] if previous else None)
+
+    if not args.no_save:
+        history.append(record)
+        with open(args.history, "w") as file:
+            json.dump(history, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,15 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[("C:/Users/reggie.gilliard/OneDrive - HHS Office of the Secretary/OFA TANF Longitudinal Dataset/input/Instruction Crosswalk.xlsx", ".")],
-    hiddenimports=[],
+    # Modules re-exported lazily by otld.utils, which the analysis cannot follow
+    hiddenimports=[
+        "otld.utils.checks",
+        "otld.utils.states",
+        "otld.utils.openpyxl_utils",
+        "otld.utils.pandas_utils",
+        "otld.utils.string_utils",
+        "otld.utils.tableau_utils",
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,8 +1,11 @@
 """Class to manage appending TANF caseload and financial data"""
 
+import json
 import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 
 import pandas as pd
 
@@ -14,22 +17,116 @@ from otld.utils import (
     standardize_line_number,
     validate_data_frame,
 )
+from otld.utils.cache_utils import ParseCache, code_version
 from otld.utils.caseload_utils import (
     CASELOAD_FORMAT_OPTIONS,
     CATEGORIES,
     FAMILY_SHEET_REGEX_PATTERN,
     RECIPIENT_SHEET_REGEX_PATTERN,
     clean_dataset,
+    clean_state,
     format_final_dataset,
 )
 from otld.utils.crosswalk_dict import crosswalk_dict
 from otld.utils.financial_utils import reindex_state_year
+from otld.utils.long_store import write_long_store
+from otld.utils.pandas_utils import (
+    dict_to_parquet,
+    numeric_values,
+    parquet_to_dict,
+    round_to_integer,
+)
+from otld.utils.reshape_utils import wide_to_long
+from otld.utils.RunProfiler import RunProfiler
+from otld.utils.schema import apply_long_schema
 
 FINANCIAL_COLUMN_NAMES = {
     key: f"{key}. {value["name"]}" if value["name"] else ""
     for key, value in crosswalk_dict.items()
 }
 
+# File in a sidecar recording the workbook it was written alongside
+SIDECAR_STAMP = "workbook.json"
+
+# Pools in which worksheets can be parsed concurrently
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+
+def find_header(df: pd.DataFrame) -> pd.DataFrame:
+    """Find the header of a worksheet
+
+    Re-runs with the concatenate option if the header has duplicates, numeric columns
+    or the data frame is empty
+
+    Args:
+        df (pd.DataFrame): DataFrame to search in for a header.
+
+    Returns:
+        pd.DataFrame: DataFrame columns renamed and any leading columns dropped.
+    """
+    new_df = get_header(df)
+
+    if (
+        new_df.empty
+        or any([isinstance(col, (int, float)) for col in new_df.columns])
+        or new_df.columns.duplicated().any()
+    ):
+        new_df = get_header(df, concatenate=True)
+
+    return new_df
+
+
+def read_worksheet(kind: str, workbook: pd.ExcelFile | str, sheet: str) -> pd.DataFrame:
+    """Read and clean a worksheet from a file to append
+
+    Defined at module level so that worksheets can be parsed in a process pool.
+
+    Args:
+        kind (str): Type of data, financial or caseload.
+        workbook (pd.ExcelFile | str): Workbook, or path to the workbook, containing
+        the worksheet.
+        sheet (str): The worksheet to extract data from.
+
+    Returns:
+        pd.DataFrame: Cleaned data frame. For financial data, the index is the
+        state and all columns are numeric.
+    """
+    df = pd.read_excel(workbook, sheet_name=sheet, header=None)
+    df = find_header(df)
+
+    if kind == "financial":
+        df.columns = [str(col).strip() for col in df.columns]
+
+        # Drop if state is missing
+        state_column = df.filter(regex=re.compile("^state$", re.IGNORECASE)).columns
+        state_column = state_column[0]
+        df.dropna(subset=[state_column], inplace=True)
+        df[state_column] = df[state_column].map(lambda x: x.strip())
+        df.set_index(state_column, inplace=True)
+
+        # Convert to numeric
+        df = convert_to_numeric(df)
+        df.fillna(0, inplace=True)
+    elif kind == "caseload":
+        df = clean_dataset(df)
+
+    return df
+
+
+# Functions that produce cached frames. The parser version is derived from their
+# code, so changing any of them invalidates the frames cached by earlier versions.
+PARSER_FUNCTIONS = [
+    read_worksheet,
+    find_header,
+    get_header,
+    convert_to_numeric,
+    numeric_values,
+    round_to_integer,
+    clean_dataset,
+    clean_state,
+]
+PARSER_VERSION = code_version(*PARSER_FUNCTIONS)
+
 
 class TANFData:
     """Class to manage appending TANF caseload and financial data"""
@@ -42,6 +139,11 @@ class TANFData:
         sheets: dict[list] = {},
         footnotes: dict[list[list]] = {},
         tableau: bool = False,
+        cache_dir: str = None,
+        incremental: bool = False,
+        profiler: RunProfiler = None,
+        workers: int = 1,
+        executor: str = "process",
     ):
         """Initialize TANFData class
 
@@ -50,13 +152,29 @@ class TANFData:
             appended_path (str): Path to the appended file. Should be xlsx format.
             to_append_path (str | list[str]): Path to the file or files to append. Should be xlsx format.
             sheets (dict[list], optional): A dictionary of sheets to extract. Defaults to {}.
+            cache_dir (str, optional): Directory in which to cache parsed worksheets.
+            Caching is disabled if not specified. Defaults to None.
+            incremental (bool, optional): Read the appended data from its Parquet
+            sidecar, if one exists, rather than the Excel workbook, and write a sidecar
+            alongside the new wide workbook. Defaults to False.
+            profiler (RunProfiler, optional): Profiler in which to record the time,
+            size and memory usage of each stage. Stages are not recorded if not
+            specified. Defaults to None.
+            workers (int, optional): Number of workers in which to parse the
+            worksheets of every level concurrently. 1 parses worksheets serially and
+            None uses the number of CPUs. Defaults to 1.
+            executor (str, optional): Pool in which to parse worksheets, process or
+            thread. Threads avoid starting processes, e.g. from the GUI. Defaults to
+            process.
         """
 
         assert appended_path.endswith(
             ".xlsx"
         ), "Appended file is not an xlsx formatted Excel Workbook"
 
-        self._appended = pd.ExcelFile(appended_path)
+        # The appended workbook is only opened if it is read
+        self._appended = None
+        self._appended_path = appended_path
 
         self._type = type.lower()
 
@@ -70,10 +188,21 @@ class TANFData:
         self.set_sheets(sheets)
         self._footnotes = footnotes
         self._tableau = tableau
+        self._cache = ParseCache(cache_dir, PARSER_VERSION) if cache_dir else None
+        self._incremental = incremental
+        self._profiler = profiler or RunProfiler(enabled=False)
+
+        if executor not in EXECUTORS:
+            raise ValueError(f"Executor must be one of {list(EXECUTORS)}: {executor}")
+        self._workers = workers
+        self._executor = executor
+        self._parsed = {}
 
     @property
     def appended(self):
-        """Base file containing appended data"""
+        """Base file containing appended data, opened on first use"""
+        if self._appended is None:
+            self._appended = pd.ExcelFile(self._appended_path)
         return self._appended
 
     @property
@@ -101,6 +230,42 @@ class TANFData:
         """Boolean indicating whether tableau-specific datasets should be output"""
         return self._tableau
 
+    @property
+    def cache(self):
+        """Cache of parsed worksheets, or None if caching is disabled"""
+        return self._cache
+
+    @property
+    def incremental(self):
+        """Boolean indicating whether appended data is read from a Parquet sidecar"""
+        return self._incremental
+
+    @property
+    def profiler(self):
+        """Profiler recording the stages of the run"""
+        return self._profiler
+
+    @property
+    def workers(self):
+        """Number of workers parsing worksheets, where 1 parses them serially"""
+        return self._workers
+
+    @property
+    def executor(self):
+        """Pool in which worksheets are parsed concurrently, process or thread"""
+        return self._executor
+
+    @staticmethod
+    def sidecar_path(path: str) -> str:
+        """Path of the Parquet sidecar associated with a wide Excel workbook"""
+        return f"{os.path.splitext(path)[0]}.parquet"
+
+    @staticmethod
+    def workbook_stamp(path: str) -> dict:
+        """Size and modification time of a workbook, recorded in its sidecar"""
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
     def load_data(self, to_append_path: str | list[str]):
         """Load TANF data to append
 
@@ -128,6 +293,7 @@ class TANFData:
             ), "File to append is not an xlsx formatted Excel Workbook"
 
             # Load file
+            self._to_append["path"] = to_append_path
             self._to_append["data"] = pd.ExcelFile(to_append_path)
 
             # Get year of file
@@ -146,9 +312,12 @@ class TANFData:
                 len(to_append_path) == 3
             ), f"Too many caseload files found: {len(to_append_path)}."
             # Load files
+            self._to_append["path"] = {
+                self.identify_workbook_level(path): path for path in to_append_path
+            }
             self._to_append["data"] = {
-                self.identify_workbook_level(path): pd.ExcelFile(path)
-                for path in to_append_path
+                level: pd.ExcelFile(path)
+                for level, path in self._to_append["path"].items()
             }
 
             # Assume year of first file is the year of all files
@@ -260,30 +429,73 @@ class TANFData:
     def append(self):
         """Append financial or caseload data"""
 
+        sidecar = self.load_sidecar()
+        if self._workers != 1:
+            self.parse_sheets()
+
         # Append data
         for level in self._sheet_dict[self._type]:
             self._level = level
             self.get_worksheets()
             self.get_df()
-            self._frames[level] = pd.concat(
-                [
-                    pd.read_excel(
-                        self._appended,
-                        sheet_name=level,
-                        index_col=[0, 1],
-                    ),
-                    self._df,
-                ]
-            )
+            with self._profiler.stage("base", level) as stage:
+                base = self.get_base(sidecar)
+                stage.update(RunProfiler.size(base))
+            with self._profiler.stage("concat", level) as stage:
+                self._frames[level] = pd.concat([base, self._df])
+                stage.update(RunProfiler.size(self._frames[level]))
             del self._df
 
         self.export_workbook()
 
-    def get_header_wrapper(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Wrapper for get_header
+    def load_sidecar(self) -> dict[pd.DataFrame] | None:
+        """Load the Parquet sidecar of the appended workbook
 
-        Re-runs with the concatenate option if the header has duplicates, numeric columns
-        or the data frame is empty
+        Returns:
+            dict[pd.DataFrame] | None: Appended data keyed by funding level, or None
+            if not running incrementally, no sidecar exists or the workbook has
+            changed since the sidecar was written.
+        """
+        path = self.sidecar_path(self._appended_path)
+        if not self._incremental or not os.path.isdir(path):
+            return None
+
+        # A workbook edited or replaced after its sidecar was written is read instead
+        try:
+            with open(os.path.join(path, SIDECAR_STAMP)) as f:
+                stamp = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stamp != self.workbook_stamp(self._appended_path):
+            return None
+
+        return parquet_to_dict(path)
+
+    def get_base(self, sidecar: dict[pd.DataFrame] | None = None) -> pd.DataFrame:
+        """Get the appended data for the current level
+
+        Args:
+            sidecar (dict[pd.DataFrame] | None, optional): Appended data loaded from
+            the Parquet sidecar. If None, the data is read from the appended workbook.
+            Defaults to None.
+
+        Returns:
+            pd.DataFrame: Appended data for the current level.
+        """
+        if sidecar is None:
+            return pd.read_excel(
+                self.appended,
+                sheet_name=self._level,
+                index_col=[0, 1],
+            )
+
+        # Drop rows for the year being appended so that re-runs replace them
+        df = sidecar[self._level]
+        years = df.index.get_level_values("FiscalYear")
+        return df[years != self._to_append["year"]]
+
+    def get_header_wrapper(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Wrapper for find_header
 
         Args:
             df (pd.DataFrame): DataFrame to search in for a header.
@@ -291,16 +503,107 @@ class TANFData:
         Returns:
             pd.DataFrame: DataFrame columns renamed and any leading columns dropped.
         """
-        new_df = get_header(df)
+        return find_header(df)
 
-        if (
-            new_df.empty
-            or any([isinstance(col, (int, float)) for col in new_df.columns])
-            or new_df.columns.duplicated().any()
+    def workbook(self, level: str) -> tuple[str, pd.ExcelFile]:
+        """Path to and workbook of the file to append for a level
+
+        Args:
+            level (str): The funding level.
+
+        Returns:
+            tuple[str, pd.ExcelFile]: Path to the workbook and the loaded workbook.
+        """
+        if self._type == "financial":
+            return self._to_append["path"], self._to_append["data"]
+
+        return self._to_append["path"][level], self._to_append["data"][level]
+
+    def parse_sheets(self):
+        """Parse the worksheets of every level concurrently
+
+        Worksheets that are not cached are read in a pool of TANFData.workers
+        processes or threads, each opening the workbook from its path. The frames are
+        held until parse_sheet requests them, so levels are assembled in the same
+        order as a serial run.
+        """
+        tasks = []
+        for level in self._sheet_dict[self._type]:
+            self._level = level
+            self.get_worksheets()
+            sheets = self._sheets if isinstance(self._sheets, list) else [self._sheets]
+            for sheet in sheets:
+                path, _ = self.workbook(level)
+                df = self._cache.get(path, self._type, sheet) if self._cache else None
+                if df is None:
+                    tasks.append((level, sheet, path))
+                else:
+                    self._parsed[(level, sheet)] = df
+
+        if not tasks:
+            return
+
+        workers = min(self._workers or os.cpu_count() or 1, len(tasks))
+        with self._profiler.stage(
+            "parse sheets", executor=self._executor, workers=workers, sheets=len(tasks)
         ):
-            new_df = get_header(df, concatenate=True)
+            with EXECUTORS[self._executor](max_workers=workers) as executor:
+                levels, sheets, paths = zip(*tasks)
+                frames = executor.map(read_worksheet, repeat(self._type), paths, sheets)
+                for level, sheet, path, df in zip(levels, sheets, paths, frames):
+                    if self._cache:
+                        self._cache.set(path, self._type, sheet, df=df)
+                    self._parsed[(level, sheet)] = df
+
+    def parse_sheet(self, level: str, sheet: str) -> pd.DataFrame:
+        """Read and clean a worksheet from a file to append
+
+        Parsed worksheets are stored in TANFData.cache, when enabled, so that
+        unchanged files are not re-parsed on subsequent runs.
+
+        Args:
+            level (str): The current funding level.
+            sheet (str): The worksheet to extract data from.
+
+        Returns:
+            pd.DataFrame: Cleaned data frame. For financial data, the index is the
+            state and all columns are numeric.
+        """
+        path, workbook = self.workbook(level)
+
+        with self._profiler.stage(
+            "parse", level, os.path.basename(path), sheet=sheet
+        ) as stage:
+            # Worksheets parsed concurrently by parse_sheets are only collected here
+            df = self._parsed.pop((level, sheet), None)
+            if df is not None:
+                stage["prefetched"] = True
+            else:
+                df = self._cache.get(path, self._type, sheet) if self._cache else None
+                stage["cached"] = df is not None
+            if df is None:
+                df = self.read_sheet(workbook, path, sheet)
+            stage.update(RunProfiler.size(df))
+
+        return df
+
+    def read_sheet(self, workbook: pd.ExcelFile, path: str, sheet: str) -> pd.DataFrame:
+        """Read and clean a worksheet, storing the result in TANFData.cache
+
+        Args:
+            workbook (pd.ExcelFile): Workbook containing the worksheet.
+            path (str): Path to the workbook.
+            sheet (str): The worksheet to extract data from.
+
+        Returns:
+            pd.DataFrame: Cleaned data frame.
+        """
+        df = read_worksheet(self._type, workbook, sheet)
 
-        return new_df
+        if self._cache:
+            self._cache.set(path, self._type, sheet, df=df)
+
+        return df
 
     def get_df(self):
         """Get data from file to append
@@ -312,53 +615,44 @@ class TANFData:
         worksheet = self._sheets
         level = self._level
         if self._type == "financial":
-            df = pd.read_excel(
-                self._to_append["data"], sheet_name=worksheet, header=None
-            )
-            df = self.get_header_wrapper(df)
-            df.columns = [str(col).strip() for col in df.columns]
+            df = self.parse_sheet(level, worksheet)
 
-            # Add year column
+            # Add year to index
             df["Year"] = self._to_append["year"]
-
-            # Drop if state is missing
-            state_column = df.filter(regex=re.compile("^state$", re.IGNORECASE)).columns
-            state_column = state_column[0]
-            df.dropna(subset=[state_column], inplace=True)
-            df[state_column] = df[state_column].map(lambda x: x.strip())
-            df.set_index([state_column, "Year"], inplace=True)
+            df.set_index("Year", append=True, inplace=True)
             df.index.rename(["State", "FiscalYear"], inplace=True)
 
-            # Convert to numeric
-            df = df.apply(convert_to_numeric)
-            df.fillna(0, inplace=True)
-
             self._df = df
-            self.rename_columns()
-            self.validate_data_frame()
+            with self._profiler.stage("rename", level) as stage:
+                self.rename_columns()
+                stage.update(RunProfiler.size(self._df))
+            with self._profiler.stage("validate", level) as stage:
+                self.validate_data_frame()
+                stage.update(RunProfiler.size(self._df))
 
         elif self._type == "caseload":
-            data = []
-            for sheet in worksheet:
-                df = pd.read_excel(
-                    self._to_append["data"][level], sheet_name=sheet, header=None
-                )
-                df = self.get_header_wrapper(df)
-                df = clean_dataset(df)
-                data.append(df)
+            data = [self.parse_sheet(level, sheet) for sheet in worksheet]
 
-            df = data[0].merge(data[1], on="State", how="outer", indicator=True)
-            assert (df["_merge"] == "both").all(), "Imperfect merge."
-            df.drop("_merge", axis=1, inplace=True)
+            with self._profiler.stage("merge", level) as stage:
+                df = data[0].merge(data[1], on="State", how="outer", indicator=True)
+                assert (df["_merge"] == "both").all(), "Imperfect merge."
+                df.drop("_merge", axis=1, inplace=True)
+                stage.update(RunProfiler.size(df))
 
             self._df = df
-            self.rename_columns()
-
-            self._df["FiscalYear"] = self._to_append["year"]
-            self._df = format_final_dataset(self._df)
-            self._df.set_index(["State", "FiscalYear"], inplace=True)
-            self._df = reindex_state_year(self._df, ["State", "FiscalYear"])
-            self.validate_data_frame()
+            with self._profiler.stage("rename", level) as stage:
+                self.rename_columns()
+                stage.update(RunProfiler.size(self._df))
+
+            with self._profiler.stage("format", level) as stage:
+                self._df["FiscalYear"] = self._to_append["year"]
+                self._df = format_final_dataset(self._df)
+                self._df.set_index(["State", "FiscalYear"], inplace=True)
+                self._df = reindex_state_year(self._df, ["State", "FiscalYear"])
+                stage.update(RunProfiler.size(self._df))
+            with self._profiler.stage("validate", level) as stage:
+                self.validate_data_frame()
+                stage.update(RunProfiler.size(self._df))
 
         # Currently caseload data fails the numeric check because "-" and other string
         # characters are allowed in columns
@@ -413,21 +707,21 @@ class TANFData:
             self._df.columns = self._df.columns.map(rename)
 
     def validate_data_frame(self):
-        """Wraps validate_data_frame; Ensures a copy is used"""
+        """Wraps validate_data_frame and checks the column names
+
+        Raises:
+            AssertionError: Listing every violation found.
+        """
+        result = validate_data_frame(self._df, raise_errors=False)
 
-        df = self._df.copy()
-        validate_data_frame(df)
         columns = self._df.columns
         if self._type == "caseload":
-            incorrect = [column for column in columns if column not in CATEGORIES]
-            assert incorrect == [], f"Incorrect columns {incorrect}"
+            result.add("columns", columns[~columns.isin(CATEGORIES)].to_list())
         elif self._type == "financial":
-            incorrect = [
-                column
-                for column in columns
-                if column not in list(FINANCIAL_COLUMN_NAMES.values())
-            ]
-            assert incorrect == [], f"Incorrect columns {incorrect}"
+            valid = list(FINANCIAL_COLUMN_NAMES.values())
+            result.add("columns", columns[~columns.isin(valid)].to_list())
+
+        result.raise_for_violations()
 
     def export_workbook(self):
         """Export data to Excel workbook"""
@@ -444,15 +738,33 @@ class TANFData:
             self._out_dir,
             f"{title}Wide_{current_date}.xlsx",
         )
-        export_workbook(
-            self._frames, path, format_options=format_options, footnotes=self._footnotes
-        )
-        if self._tableau:
+        size = {
+            "rows": sum(df.shape[0] for df in self._frames.values()),
+            "cells": sum(int(df.size) for df in self._frames.values()),
+        }
+        with self._profiler.stage(
+            "export wide", workbook=os.path.basename(path), **size
+        ):
             export_workbook(
                 self._frames,
-                path.replace(f"{title}Wide_", f"{title}WideTableau_"),
+                path,
                 format_options=format_options,
+                footnotes=self._footnotes,
             )
+        if self._incremental:
+            with self._profiler.stage("sidecar", **size):
+                sidecar = self.sidecar_path(path)
+                dict_to_parquet(self._frames, sidecar)
+                with open(os.path.join(sidecar, SIDECAR_STAMP), "w") as f:
+                    json.dump(self.workbook_stamp(path), f)
+        if self._tableau:
+            tableau_path = path.replace(f"{title}Wide_", f"{title}WideTableau_")
+            with self._profiler.stage(
+                "export tableau", workbook=os.path.basename(tableau_path), **size
+            ):
+                export_workbook(
+                    self._frames, tableau_path, format_options=format_options
+                )
 
         # Reshape and export long data
         path = os.path.join(
@@ -460,27 +772,31 @@ class TANFData:
             f"{title}Long_{current_date}.xlsx",
         )
 
-        self._frames[title] = []
-        for frame in self._frames:
-            if frame == title:
-                continue
-            self._frames[frame] = self._frames[frame].melt(
-                var_name="Category", value_name="Amount", ignore_index=False
+        with self._profiler.stage("melt") as stage:
+            # The wide frames are released as they are stacked
+            self._frames = {
+                title: apply_long_schema(
+                    wide_to_long(self._frames, "Amount", consume=True)
+                )
+            }
+            stage.update(RunProfiler.size(self._frames[title]))
+
+        with self._profiler.stage(
+            "export long",
+            workbook=os.path.basename(path),
+            **RunProfiler.size(self._frames[title]),
+        ):
+            export_workbook(
+                self._frames,
+                path,
+                format_options=format_options,
+                footnotes=long_notes(title, self._footnotes),
+                streaming=True,
             )
-            self._frames[frame]["Funding"] = frame
-            self._frames[title].append(self._frames[frame])
-
-        self._frames[title] = pd.concat(self._frames[title])
-        for frame in list(self._frames.keys()):
-            if frame != title:
-                del self._frames[frame]
-
-        export_workbook(
-            self._frames,
-            path,
-            format_options=format_options,
-            footnotes=long_notes(title, self._footnotes),
-        )
+        with self._profiler.stage(
+            "long store", **RunProfiler.size(self._frames[title])
+        ):
+            write_long_store(self._frames[title], self.sidecar_path(path))
 
     def close_excel_files(self):
         """Close all files"""
@@ -491,7 +807,8 @@ class TANFData:
         else:
             workbooks.close()
 
-        self.appended.close()
+        if self._appended is not None:
+            self._appended.close()
 
 
 if __name__ == "__main__":
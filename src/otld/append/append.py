@@ -5,8 +5,10 @@ import json
 import os
 import re
 import sys
+import time
 
-from otld.append.TANFData import TANFData
+from otld.paths import diagnostics_dir
+from otld.utils.RunProfiler import RunProfiler
 
 
 class TANFAppend:
@@ -23,6 +25,11 @@ class TANFAppend:
         self._sheets = parser.sheets
         self._footnotes = parser.footnotes or {}
         self._tableau = parser.tableau or False
+        self._cache = parser.cache
+        self._incremental = parser.incremental or False
+        self._profile = parser.profile
+        self._workers = parser.workers or None
+        self._executor = parser.executor
         self.setup()
 
     def setup(self):
@@ -91,6 +98,43 @@ class TANFAppend:
             dest="tableau",
             help="Generate an additional file without headers or footers suitable for use in the creation of tableau files.",
         )
+        parser.add_argument(
+            "-c",
+            "--cache",
+            dest="cache",
+            type=str,
+            help="Directory in which to cache parsed worksheets. Re-runs on unchanged files skip Excel parsing.",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            dest="incremental",
+            help="Read appended data from its Parquet sidecar rather than the Excel workbook, and write a sidecar alongside the new wide workbook.",
+        )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            dest="workers",
+            type=int,
+            default=1,
+            help="Number of workers in which to parse the worksheets of the files to append concurrently. 0 uses the number of CPUs. Defaults to 1.",
+        )
+        parser.add_argument(
+            "--executor",
+            dest="executor",
+            choices=["process", "thread"],
+            default="process",
+            help="Pool in which worksheets are parsed when using more than one worker. Defaults to process.",
+        )
+
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="",
+            dest="profile",
+            type=str,
+            help="Record the time, size and memory usage of each stage and save a run report to the given directory. Defaults to the diagnostics directory if it exists, otherwise the directory of the base file.",
+        )
 
         return parser.parse_args(args)
 
@@ -133,19 +177,45 @@ class TANFAppend:
 
         return self
 
+    def profile_directory(self) -> str:
+        """Directory in which to save the run report"""
+        if self._profile:
+            return self._profile
+        elif os.path.isdir(diagnostics_dir):
+            return diagnostics_dir
+
+        return os.path.dirname(os.path.abspath(self._appended))
+
     def append(self):
         """Instantiate TANFData object and call append method"""
-        tanf_data = TANFData(
-            self._kind,
-            self._appended,
-            self._to_append,
-            self._sheets,
-            self._footnotes,
-            self._tableau,
-        )
+        # Imported here so that parsing arguments does not load the data stack
+        from otld.append.TANFData import TANFData
+
+        profiler = RunProfiler("tanf-append", enabled=self._profile is not None)
+        with profiler.stage("load"):
+            tanf_data = TANFData(
+                self._kind,
+                self._appended,
+                self._to_append,
+                self._sheets,
+                self._footnotes,
+                self._tableau,
+                self._cache,
+                self._incremental,
+                profiler,
+                workers=self._workers,
+                executor=self._executor,
+            )
         tanf_data.append()
         tanf_data.close_excel_files()
 
+        if profiler.enabled:
+            current_date = time.strftime("%Y%m%d", time.gmtime())
+            profiler.export(
+                self.profile_directory(),
+                f"{self._kind.title()}AppendProfile_{current_date}",
+            )
+
 
 def main():
     """Command line entry point"""
@@ -171,11 +171,8 @@ def get_tanf_df(paths: list[str], year: int) -> tuple[pd.DataFrame]:
                     tracker["RenamedColumns"], tracker["BaseColumns"]
                 )
             }
-            # Convert columns to integer
-            tanf_df = tanf_df.map(
-                lambda x: 0 if type(x) is str and x.strip() == "-" else x
-            )
-            tanf_df = tanf_df.apply(convert_to_numeric)
+            # Convert columns to integer ("-" placeholders become 0)
+            tanf_df = convert_to_numeric(tanf_df)
             tanf_df.fillna(0, inplace=True)
 
             # Select columns
@@ -4,19 +4,17 @@ import json
 import os
 import re
 
-import openpyxl
 import pandas as pd
 
 from otld.paths import diagnostics_dir, input_dir, inter_dir
 from otld.utils import (
     FinancialDataChecker,
     convert_to_numeric,
-    delete_empty_columns,
-    get_column_names,
     standardize_line_number,
     validate_data_frame,
 )
 from otld.utils.LineTracker import LineTracker
+from otld.utils.WorkbookSession import WorkbookSession
 
 line_tracker = LineTracker()
 
@@ -90,7 +88,7 @@ def rename_columns(
 
 
 def get_tanf_df(
-    tanf_path: str | os.PathLike,
+    workbook: WorkbookSession,
     sheets: list[str],
     year: int,
     column_dict: dict,
@@ -99,7 +97,7 @@ def get_tanf_df(
     """Get data from TANF Financial files
 
     Args:
-        tanf_path (str | os.PathLike): Path to TANF file.
+        workbook (WorkbookSession): Open TANF file.
         sheets (list[str]): List of sheets to extract.
         year (int): The year associated with the Excel workbook.
         column_dict (dict): A dictionary mapping line numbers to field names.
@@ -109,23 +107,13 @@ def get_tanf_df(
         pd.DataFrame: Appended workbooks as data frames.
     """
     data = []
-    tanf_excel_file = openpyxl.load_workbook(tanf_path)
-
-    path_stem = os.path.split(tanf_path)[1]
 
     for sheet in sheets:
         # Begin building tracker dictionary
-        tracker = {"FileName": path_stem, "SheetName": sheet, "Level": level}
-
-        # Use openpyxl to get column names and delete columns with no data
-        tanf_df = tanf_excel_file[sheet]
-        delete_empty_columns(tanf_df)
-        columns, i = get_column_names(tanf_df)
-
-        # Read in data with pandas and rename columns
-        tanf_df = pd.read_excel(tanf_path, sheet_name=sheet, skiprows=i, header=None)
-        tanf_df.columns = columns
+        tracker = {"FileName": workbook.name, "SheetName": sheet, "Level": level}
 
+        # Read in data with column names, skipping columns with no data, and rename
+        tanf_df = workbook.read_table(sheet)
         tanf_df = rename_columns(tanf_df, sheet, column_dict, tracker)
         assert len(tracker["BaseColumns"]) == len(tracker["RenamedColumns"])
 
@@ -144,7 +132,7 @@ def get_tanf_df(
     tanf_df = tanf_df.loc[:, ~tanf_df.columns.duplicated()]
 
     # Convert columns to int
-    tanf_df = tanf_df.apply(convert_to_numeric)
+    tanf_df = convert_to_numeric(tanf_df)
     tanf_df.fillna(0, inplace=True)
 
     # Add year
@@ -192,8 +180,9 @@ def main(export: bool = False) -> tuple[pd.DataFrame]:
             continue
 
         line_tracker.sources[year] = []
-        federal_df = get_tanf_df(file.path, fed_sheets, year, column_dict, "Federal")
-        state_df = get_tanf_df(file.path, state_sheets, year, column_dict, "State")
+        with WorkbookSession(file.path) as workbook:
+            federal_df = get_tanf_df(workbook, fed_sheets, year, column_dict, "Federal")
+            state_df = get_tanf_df(workbook, state_sheets, year, column_dict, "State")
 
         federal.append(federal_df)
         state.append(state_df)
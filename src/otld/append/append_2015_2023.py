@@ -4,20 +4,18 @@ import json
 import os
 import re
 
-import openpyxl
 import pandas as pd
-from fuzzywuzzy import fuzz, process
 
 from otld.paths import diagnostics_dir, input_dir, inter_dir
 from otld.utils import (
     FinancialDataChecker,
     convert_to_numeric,
-    delete_empty_columns,
-    get_column_names,
     standardize_line_number,
     validate_data_frame,
 )
+from otld.utils.HeaderMatcher import HeaderMatcher
 from otld.utils.LineTracker import LineTracker
+from otld.utils.WorkbookSession import WorkbookSession
 
 line_tracker = LineTracker()
 
@@ -53,22 +51,17 @@ def rename_columns(df: pd.DataFrame, column_dict: dict, tracker: dict) -> pd.Dat
         numbers = [match.group(1).replace(".", "") for match in numbers]
         renamer = {columns[i]: number for i, number in enumerate(numbers)}
     else:
-        # Use fuzzy matching
+        # Match headers to field names, reusing matches from earlier sheets
         column_list = list(column_dict.values())
-        fuzzy_matches = [
-            process.extractOne(column, column_list, scorer=fuzz.ratio, score_cutoff=80)
-            for column in columns
-        ]
+        matcher = HeaderMatcher.for_names(column_list)
 
         renamer = {}
 
         for i, column in enumerate(columns):
-            # If match and column at position are identical, use match
-            if fuzzy_matches[i] == column_list[i]:
-                renamer[column] = inverted_column_dict[fuzzy_matches[i][0]]
+            match = matcher.match(column)
             # If there is a perfect match, use match
-            elif fuzzy_matches[i] is not None and fuzzy_matches[i][1] == 100:
-                renamer[column] = inverted_column_dict[fuzzy_matches[i][0]]
+            if match is not None:
+                renamer[column] = inverted_column_dict[match]
             # Otherwise, use column at the current position
             else:
                 renamer[column] = inverted_column_dict[column_list[i]]
@@ -81,12 +74,12 @@ def rename_columns(df: pd.DataFrame, column_dict: dict, tracker: dict) -> pd.Dat
 
 
 def get_tanf_df(
-    tanf_path: str | os.PathLike, sheet: str, year: int, column_dict: dict, level: str
+    workbook: WorkbookSession, sheet: str, year: int, column_dict: dict, level: str
 ) -> pd.DataFrame:
     """Extract TANF data from Excel file
 
     Args:
-        tanf_path (str | os.PathLike): Path to TANF Excel file
+        workbook (WorkbookSession): Open TANF Excel file
         sheet (str): Sheet name to extract data from
         year (int): Year of data
         column_dict (dict): Dictionary mapping line numbers to field names.
@@ -95,20 +88,12 @@ def get_tanf_df(
     Returns:
         pd.DataFrame: Extracted TANF data
     """
-    path_stem = os.path.split(tanf_path)[1]
-    tracker = {"FileName": path_stem, "SheetName": sheet, "Level": level}
+    tracker = {"FileName": workbook.name, "SheetName": sheet, "Level": level}
 
-    # Load data and delete columns with no data
-    tanf_excel_file = openpyxl.load_workbook(tanf_path)
-    tanf_df = tanf_excel_file[sheet]
-    delete_empty_columns(tanf_df)
-
-    # Get column names and load data with pandas
-    columns, i = get_column_names(tanf_df)
-    tanf_df = pd.read_excel(tanf_path, sheet_name=sheet, skiprows=i, header=None)
+    # Load data with column names, skipping columns with no data
+    tanf_df = workbook.read_table(sheet)
 
     # Rename columns and add year
-    tanf_df.columns = columns
     tanf_df = rename_columns(tanf_df, column_dict, tracker)
     assert len(tracker["BaseColumns"]) == len(tracker["RenamedColumns"])
 
@@ -118,7 +103,7 @@ def get_tanf_df(
     tanf_df.set_index("STATE", inplace=True)
 
     # Convert to numeric
-    tanf_df = tanf_df.apply(convert_to_numeric)
+    tanf_df = convert_to_numeric(tanf_df)
     tanf_df.fillna(0, inplace=True)
 
     # Add year column
@@ -158,14 +143,17 @@ def main(export: bool = False) -> tuple[pd.DataFrame]:
             continue
 
         line_tracker.sources[year] = []
-        federal.append(
-            get_tanf_df(
-                file.path, "C.1 Federal Expenditures", year, column_dict, "Federal"
+        with WorkbookSession(file.path) as workbook:
+            federal.append(
+                get_tanf_df(
+                    workbook, "C.1 Federal Expenditures", year, column_dict, "Federal"
+                )
+            )
+            state.append(
+                get_tanf_df(
+                    workbook, "C.2 State Expenditures", year, column_dict, "State"
+                )
             )
-        )
-        state.append(
-            get_tanf_df(file.path, "C.2 State Expenditures", year, column_dict, "State")
-        )
 
     line_tracker.export(os.path.join(diagnostics_dir, "LineSources.xlsx"))
 
@@ -1,14 +1,17 @@
 "Append historical caseload data"
 
+import argparse
 import os
 import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional
 
 import pandas as pd
 
 from otld.paths import DATA_DIR, diagnostics_dir, out_dir, tableau_dir
 from otld.utils import export_workbook, get_header
+from otld.utils.cache_utils import WorkbookCache
 from otld.utils.caseload_utils import (
     CASELOAD_FOOTNOTES_LONG,
     CASELOAD_FOOTNOTES_WIDE,
@@ -23,6 +26,7 @@ from otld.utils.caseload_utils import (
     process_sheet,
 )
 from otld.utils.checks import CaseloadDataChecker
+from otld.utils.reshape_utils import wide_to_long
 
 # Configuration
 DATA_CONFIGS = {
@@ -169,7 +173,7 @@ def process_workbook(
     file_path: str,
     data_type: str,
     year: int,
-    master_wide: pd.DataFrame,
+    cache: Optional[WorkbookCache] = None,
 ) -> pd.DataFrame:
     """Extract and transform caseload data from Excel file
 
@@ -177,7 +181,9 @@ def process_workbook(
         file_path (str): Path to caseload data
         data_type (str): Funding level of data (State, Federal, Total)
         year (int): The fiscal year associated with the caseload data.
-        master_wide (pd.DataFrame): Wide data frame to append new records to
+        cache (Optional[WorkbookCache]): Cache of the run from which to read the
+        workbook. Defaults to None (a cache for this workbook only, cleared on
+        return).
 
     Raises:
         FileNotFoundError: Raise a FileNotFoundError if the target file does not exist.
@@ -185,8 +191,15 @@ def process_workbook(
         cannot be found.
 
     Returns:
-        pd.DataFrame: Concatenated data frame.
+        pd.DataFrame: Caseload data for the workbook. Empty if no data was found.
     """
+    if cache is None:
+        cache = WorkbookCache()
+        try:
+            return process_workbook(file_path, data_type, year, cache)
+        finally:
+            cache.clear()
+
     try:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File does not exist: {file_path}")
@@ -196,20 +209,19 @@ def process_workbook(
         # Special handling for 1998 and 1999
         if year in [1997, 1998, 1999]:
             try:
-                df = pd.read_excel(file_path, header=None)
+                df = cache.read_excel(file_path, header=None)
                 index = get_header(df, 0, "total", reset=True, sanitize=True, idx=True)
                 df = df.iloc[index + 1 :, :]
-                df = process_1997_1998_1999_data(year, df, master_wide)
+                df = process_1997_1998_1999_data(year, df)
                 df = clean_dataset(df)
                 df = format_final_dataset(df, OUTPUT_COLUMNS)
-                return pd.concat([master_wide, df])
+                return df
             except Exception as e:
                 print(f"\nError reading {year} data: {e}")
                 raise
 
         config = DATA_CONFIGS[data_type]
-        xls = pd.ExcelFile(file_path)
-        sheet_names = xls.sheet_names
+        sheet_names = cache.sheet_names(file_path)
 
         families_tab = find_matching_sheet(
             sheet_names, config["families_pattern"], file_path
@@ -228,6 +240,7 @@ def process_workbook(
             sheet_name=families_tab,
             column_names=config["column_mappings"]["families"],
             year=year,
+            cache=cache,
         )
 
         recipients_data = process_sheet(
@@ -235,6 +248,7 @@ def process_workbook(
             sheet_name=recipients_tab,
             column_names=config["column_mappings"]["recipients"],
             year=year,
+            cache=cache,
         )
 
         if families_data is None or recipients_data is None:
@@ -256,22 +270,20 @@ def process_workbook(
 
         merged_data = merge_datasets(families_data, recipients_data, year)
         if merged_data.empty:
-            return master_wide
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
 
         if year == 2012 and data_type == "State":
             merged_data = merged_data.drop("One Parent Families", axis=1).merge(
-                extract_missing_average(file_path, "one-parent", generate=True),
+                extract_missing_average(
+                    file_path, "one-parent", generate=True, cache=cache
+                ),
                 how="left",
                 on="State",
             )
 
         final_data = format_final_dataset(merged_data, OUTPUT_COLUMNS)
-        if final_data.empty:
-            return master_wide
-
-        master_wide = pd.concat([master_wide, final_data], ignore_index=True)
 
-        return master_wide
+        return final_data
 
     except Exception as e:
         print(f"\nError processing {file_path} ({data_type})")
@@ -279,8 +291,44 @@ def process_workbook(
         raise
 
 
-def main():
-    """Entry point for caseload data processing"""
+def process_workbooks(
+    tasks: list[tuple[str, str, int]],
+    workers: int = 1,
+    cache: Optional[WorkbookCache] = None,
+) -> list[pd.DataFrame]:
+    """Run process_workbook for each task, optionally in a pool of processes
+
+    Args:
+        tasks (list[tuple[str, str, int]]): Arguments to process_workbook (path,
+        funding level and year) for each workbook.
+        workers (int, optional): Number of worker processes. 1 processes workbooks
+        serially and None uses the number of CPUs. Defaults to 1.
+        cache (Optional[WorkbookCache]): Cache of the run from which serially
+        processed workbooks are read. Workbooks processed in a pool are read
+        through a cache of their own, as caches are not shared between processes.
+        Defaults to None.
+
+    Returns:
+        list[pd.DataFrame]: Data frames in the same order as tasks.
+    """
+    if not tasks:
+        return []
+
+    if workers == 1:
+        return [process_workbook(*task, cache=cache) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_workbook, *zip(*tasks)))
+
+
+def main(workers: int = 1):
+    """Entry point for caseload data processing
+
+    Args:
+        workers (int, optional): Number of worker processes used to read workbooks.
+        1 processes workbooks serially and None uses the number of CPUs.
+        Defaults to 1.
+    """
     for file in os.listdir(DATA_DIR):
         path = os.path.join(DATA_DIR, file)
         if re.search(r"tanf?_caseload", file):
@@ -290,23 +338,30 @@ def main():
         else:
             FILES["State"].append(path)
 
-    master_wide = {
-        tab: pd.DataFrame(columns=OUTPUT_COLUMNS) for tab in TAB_NAMES.values()
-    }
+    # Order workbooks by (level, year) so results are merged deterministically
+    levels = list(TAB_NAMES.values())
+    tasks = [
+        (file_path, data_type, int(file_path.split("fy")[1][:4]))
+        for data_type, file_list in FILES.items()
+        for file_path in file_list
+    ]
+    tasks.sort(key=lambda task: (levels.index(TAB_NAMES[task[1]]), task[2]))
+
+    # Workbooks are read through a cache for this run, which closes them at the end
+    cache = WorkbookCache()
+    try:
+        results = process_workbooks(tasks, workers, cache)
+    finally:
+        cache.clear()
 
-    # Process all files as before...
-    for data_type, file_list in FILES.items():
-        for file_path in file_list:
-            year = int(file_path.split("fy")[1][:4])
-            division_name = TAB_NAMES[data_type]
-            # if year != 2012 or division_name != "SSP_MOE":
-            #     continue
-            master_wide[division_name] = process_workbook(
-                file_path,
-                data_type,
-                year,
-                master_wide[division_name],
-            )
+    master_wide = {tab: [] for tab in levels}
+    for task, df in zip(tasks, results):
+        if not df.empty:
+            master_wide[TAB_NAMES[task[1]]].append(df)
+
+    for frame in master_wide:
+        frames = master_wide[frame] or [pd.DataFrame(columns=OUTPUT_COLUMNS)]
+        master_wide[frame] = pd.concat(frames, ignore_index=True)
 
     for frame in master_wide:
         master_wide[frame].set_index(["State", "FiscalYear"], inplace=True)
@@ -331,34 +386,24 @@ def main():
         format_options=CASELOAD_FORMAT_OPTIONS,
     )
 
-    master_wide["CaseloadData"] = []
-    for frame in master_wide:
-        if frame == "CaseloadData":
-            continue
-        master_wide[frame] = master_wide[frame].melt(
-            value_vars=CATEGORIES,
-            var_name="Category",
-            value_name="Number",
-            ignore_index=False,
+    master_wide = {
+        "CaseloadData": wide_to_long(
+            master_wide, "Number", value_vars=CATEGORIES, consume=True
         )
-        master_wide[frame]["Funding"] = frame
-        master_wide["CaseloadData"].append(master_wide[frame])
-
-    master_wide["CaseloadData"] = pd.concat(master_wide["CaseloadData"])
-    for frame in list(master_wide.keys()):
-        if frame != "CaseloadData":
-            del master_wide[frame]
+    }
 
     export_workbook(
         master_wide,
         os.path.join(tableau_dir, "data", "CaseloadDataLongRaw.xlsx"),
         format_options=CASELOAD_FORMAT_OPTIONS,
+        streaming=True,
     )
     export_workbook(
         master_wide,
         os.path.join(out_dir, long_name),
         format_options=CASELOAD_FORMAT_OPTIONS,
         footnotes=CASELOAD_FOOTNOTES_LONG,
+        streaming=True,
     )
 
     for file in [wide_name, long_name]:
@@ -369,4 +414,12 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Append historical caseload data")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to read workbooks. Defaults to 1.",
+    )
+    main(parser.parse_args().workers)
@@ -5,9 +5,14 @@ import re
 
 import pandas as pd
 
-from otld.paths import input_dir, inter_dir
+from otld.paths import inter_dir
 from otld.utils import missingness, validate_data_frame
-from otld.utils.crosswalk_2014_2015 import crosswalk, crosswalk_dict, map_columns
+from otld.utils.crosswalk_2014_2015 import (
+    get_consolidated_categories,
+    get_crosswalk,
+    get_crosswalk_dict,
+    map_columns,
+)
 from otld.utils.financial_utils import consolidate_categories, reindex_state_year
 
 
@@ -52,25 +57,79 @@ def reorder_alpha_numeric(values: list | pd.Series) -> list:
     return values
 
 
-def format_state_index(value: tuple) -> tuple:
-    """Adjust the formatting of the state index.
+def format_state_index(index: pd.MultiIndex) -> pd.MultiIndex:
+    """Adjust the formatting of the state level of an index.
+
+    State names are title cased and "Dist. of Columbia" is spelled out. The STATE
+    and year levels are renamed State and FiscalYear.
 
     Args:
-        value (tuple): Index tuple.
+        index (pd.MultiIndex): Index with STATE and year levels.
 
     Returns:
-        tuple: Index tuple with state adjusted.
+        pd.MultiIndex: Index with the state level adjusted.
     """
-    state_name = value[0].title()
-    state_name = (
-        "District of Columbia" if state_name.startswith("Dist.") else state_name
-    )
+    # Format each distinct state once, then expand to the rows through the codes
+    level = index.names.index("STATE")
+    states = index.levels[level].str.title()
+    states = states.where(~states.str.startswith("Dist."), "District of Columbia")
+
+    arrays = [index.get_level_values(i) for i in range(index.nlevels)]
+    arrays[level] = states.take(index.codes[level])
+    names = [{"STATE": "State", "year": "FiscalYear"}.get(n, n) for n in index.names]
+
+    return pd.MultiIndex.from_arrays(arrays, names=names)
+
+
+def consolidate_levels(
+    frames: dict[pd.DataFrame], instructions: pd.DataFrame, rename_dict: dict
+) -> dict[pd.DataFrame]:
+    """Consolidate, rename and validate the funding levels as one data frame
 
-    return state_name, value[1]
+    The levels are stacked keyed by Funding, so that the categories are consolidated
+    and the index formatted once. Lines a level lacks are NaN once stacked, so each
+    level then gets back its own columns and the types consolidating it alone gives.
+
+    Args:
+        frames (dict[pd.DataFrame]): Data frames keyed by funding level, indexed by
+        STATE and year.
+        instructions (pd.DataFrame): Consolidation instructions and new variable
+        names, one category per row.
+        rename_dict (dict): New names of the line columns.
+
+    Returns:
+        dict[pd.DataFrame]: Consolidated data frames keyed by funding level, indexed
+        by State and FiscalYear, without Puerto Rico.
+    """
+    # Instructions match the renamed columns, so rename before consolidating
+    stacked = pd.concat(frames, names=["Funding"])
+    stacked.rename(columns=rename_dict, inplace=True)
+    consolidate_categories(stacked, instructions)
+
+    # Title case the state names
+    stacked.index = format_state_index(stacked.index)
+    stacked.drop(index="Puerto Rico", level="State", inplace=True)
+
+    levels = {}
+    for funding, df in frames.items():
+        # Consolidating no rows gives the columns and types of the level alone
+        empty = df.iloc[:0].rename(columns=rename_dict)
+        consolidate_categories(empty, instructions)
+        dtypes = empty.dtypes
+
+        df = stacked.xs(funding, level="Funding")
+        df = df[dtypes.index].astype(dtypes.to_dict())
+
+        validate_data_frame(df)
+        levels[funding] = df
+
+    return levels
 
 
 def main() -> dict[pd.DataFrame]:
     """Entry point for combine_appended_files.py"""
+    crosswalk = get_crosswalk()
+    crosswalk_dict = get_crosswalk_dict()
 
     columns_196 = get_column_list(crosswalk, 196)
     columns_196_r = get_column_list(crosswalk, "196R")
@@ -118,27 +177,9 @@ def main() -> dict[pd.DataFrame]:
     total = reindex_state_year(total)
     total = total[reorder_alpha_numeric(total.columns)]
 
-    for df in [total, federal, state]:
-        # Calculate consolidated_categories
-        consolidated_categories = pd.read_excel(
-            os.path.join(input_dir, "Instruction Crosswalk.xlsx"),
-            sheet_name="consolidated_categories",
-        )
-        consolidated_categories.apply(
-            lambda row: consolidate_categories(row, df), axis=1
-        )
-        # Title case the state names
-        df.index = pd.MultiIndex.from_tuples(
-            df.index.map(format_state_index), names=["State", "FiscalYear"]
-        )
-        df.rename(columns=rename_dict, inplace=True)
-        df.drop(index="Puerto Rico", level=0, inplace=True)
-
-        validate_data_frame(df)
-
     frames.update({"Total": total})
 
-    return frames
+    return consolidate_levels(frames, get_consolidated_categories(), rename_dict)
 
 
 if __name__ == "__main__":
@@ -11,7 +11,10 @@ import pandas as pd
 
 from otld.append import combine_appended_files
 from otld.paths import DATA_DIR, out_dir, tableau_dir
+from otld.utils.long_store import write_long_store
 from otld.utils.openpyxl_utils import export_workbook
+from otld.utils.reshape_utils import wide_to_long
+from otld.utils.schema import apply_long_schema
 
 
 def format_pd_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -57,29 +60,24 @@ def main():
     long_name = "FinancialDataLong.xlsx"
     export_workbook(frames, os.path.join(out_dir, wide_name), drop_columns)
 
-    frames["FinancialData"] = []
-    for frame in frames:
-        if frame == "FinancialData":
-            continue
-        frames[frame] = frames[frame].melt(
-            var_name="Category", value_name="Amount", ignore_index=False
-        )
-        frames[frame]["Funding"] = frame
-        frames["FinancialData"].append(frames[frame])
-
-    frames["FinancialData"] = pd.concat(frames["FinancialData"])
-    for frame in list(frames.keys()):
-        if frame != "FinancialData":
-            del frames[frame]
+    frames = {
+        "FinancialData": apply_long_schema(wide_to_long(frames, "Amount", consume=True))
+    }
 
     export_workbook(
-        frames, os.path.join(tableau_dir, "data", "FinancialDataLongRaw.xlsx")
+        frames,
+        os.path.join(tableau_dir, "data", "FinancialDataLongRaw.xlsx"),
+        streaming=True,
     )
 
     frames["FinancialData"] = frames["FinancialData"][
-        frames["FinancialData"]["Category"].map(lambda x: x not in drop_columns)
+        ~frames["FinancialData"]["Category"].isin(drop_columns)
     ]
-    export_workbook(frames, os.path.join(out_dir, long_name))
+    export_workbook(frames, os.path.join(out_dir, long_name), streaming=True)
+    write_long_store(
+        frames["FinancialData"],
+        os.path.join(out_dir, long_name.replace(".xlsx", ".parquet")),
+    )
 
     for file in [wide_name, long_name]:
         shutil.copy(
@@ -64,6 +64,10 @@ class TANFData(TANFAppend):
         if tableau:
             sys.argv.append("-t")
 
+        # Parse worksheets concurrently in threads, as processes cannot be started
+        # reliably from the frozen GUI
+        sys.argv.extend(["-w", "0", "--executor", "thread"])
+
         super().__init__()
 
 
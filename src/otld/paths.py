@@ -13,3 +13,11 @@ diagnostics_dir = f"{root}\\diagnostics"
 tableau_dir = f"{root}\\tableau"
 test_dir = f"{root}\\tests"
 DATA_DIR = f"{os.path.dirname(__file__)}\\..\\..\\data"
+
+# Per-user directory for caches, which other users of the machine cannot write to
+cache_dir = os.path.join(
+    os.environ.get("LOCALAPPDATA")
+    or os.environ.get("XDG_CACHE_HOME")
+    or os.path.join(os.path.expanduser("~"), ".cache"),
+    "otld",
+)
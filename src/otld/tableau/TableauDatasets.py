@@ -3,14 +3,16 @@
 import argparse
 import os
 import sys
+import time
+from typing import TYPE_CHECKING
 
-import pandas as pd
+from otld.paths import diagnostics_dir
+from otld.utils.RunProfiler import RunProfiler
 
-from otld.tableau import tableau_datasets_caseload, tableau_datasets_financial
-from otld.utils import excel_to_dict, export_workbook, wide_with_index
-from otld.utils.caseload_utils import CASELOAD_FORMAT_OPTIONS
-from otld.utils.consolidation import CONSOLIDATION_INSTRUCTIONS
-from otld.utils.financial_utils import consolidate_categories
+# The data stack is imported when datasets are generated, so that parsing and
+# validating arguments stay fast
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class TableauDatasets:
@@ -24,6 +26,9 @@ class TableauDatasets:
         self._wide = parser.wide
         self._dest = parser.destination
         self._inflation = parser.inflation
+        self._profile = parser.profile
+        self._profiler = RunProfiler("tanf-tableau", enabled=self._profile is not None)
+        self._workbooks = None
         self.validate()
 
     def validate(self):
@@ -71,66 +76,133 @@ class TableauDatasets:
             type=str,
             help="Path to file to use for calculating inflation-adjusted figures",
         )
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="",
+            dest="profile",
+            type=str,
+            help="Record the time, size and memory usage of each stage and save a run report to the given directory. Defaults to the diagnostics directory if it exists, otherwise the destination directory.",
+        )
 
         return parser.parse_args(args)
 
     def generate_wide_data(self):
         """Generate wide tableau dataset"""
+        from otld.utils import excel_to_dict, export_workbook, wide_with_index
+        from otld.utils.caseload_utils import CASELOAD_FORMAT_OPTIONS
 
-        frames = excel_to_dict(self._wide)
+        workbook = os.path.basename(self._wide)
+        with self._profiler.stage("read", workbook=workbook) as stage:
+            frames = excel_to_dict(self._wide, cache=self.workbooks)
+            stage.update(self.size(frames))
 
         format_options = {"skip_cols": 3}
         if self._kind == "caseload":
             format_options.update(CASELOAD_FORMAT_OPTIONS)
 
-        export_workbook(
-            wide_with_index(frames, f"{self._kind.title()}Data"),
-            os.path.join(self._dest, f"{self._kind.title()}DataWide.xlsx"),
-            format_options=format_options,
-        )
+        path = os.path.join(self._dest, f"{self._kind.title()}DataWide.xlsx")
+        with self._profiler.stage(
+            "export wide", workbook=os.path.basename(path), **self.size(frames)
+        ):
+            export_workbook(
+                wide_with_index(frames, f"{self._kind.title()}Data"),
+                path,
+                format_options=format_options,
+            )
 
     def generate_long_data(self):
         """Generate long tableau dataset"""
+        import pandas as pd
+
+        from otld.tableau import tableau_datasets_caseload, tableau_datasets_financial
+        from otld.utils import excel_to_dict
+        from otld.utils.consolidation import CONSOLIDATION_INSTRUCTIONS
+        from otld.utils.financial_utils import consolidate_categories
+        from otld.utils.long_store import write_long_store
+        from otld.utils.reshape_utils import wide_to_long
+        from otld.utils.schema import apply_long_schema
 
         consolidation = pd.DataFrame.from_dict(CONSOLIDATION_INSTRUCTIONS)
         value_name = "Number" if self._kind == "caseload" else "Amount"
-        self._frames = excel_to_dict(self._wide)
-        self._df = []
+        workbook = os.path.basename(self._wide)
+        with self._profiler.stage("read", workbook=workbook) as stage:
+            self._frames = excel_to_dict(self._wide, cache=self.workbooks)
+            stage.update(self.size(self._frames))
+
         for frame in self._frames:
             df = self._frames[frame]
             if self._kind == "financial":
-                consolidation.apply(lambda row: consolidate_categories(row, df), axis=1)
+                with self._profiler.stage("consolidate", frame, **RunProfiler.size(df)):
+                    consolidate_categories(df, consolidation)
             df.set_index(["State", "FiscalYear"], inplace=True)
-            df = df.melt(
-                var_name="Category",
-                value_name=value_name,
-                ignore_index=False,
-            )
-            df["Funding"] = frame
-            self._df.append(df)
 
-        self._df = pd.concat(self._df).reset_index()
-
-        if self._kind == "caseload":
-            tableau_datasets_caseload.transform_caseload_long(self._df).to_excel(
-                os.path.join(self._dest, "CaseloadDataLong.xlsx"),
-                sheet_name="CaseloadData",
-                index=False,
-            )
-        elif self._kind == "financial":
-            tableau_datasets_financial.transform_financial_long(
-                self._df, self._inflation
-            ).to_excel(
-                os.path.join(self._dest, "FinancialDataLong.xlsx"),
-                sheet_name="FinancialData",
-                index=False,
-            )
+        with self._profiler.stage("melt") as stage:
+            # The wide frames are released as they are stacked
+            self._df = wide_to_long(self._frames, value_name, consume=True)
+            self._df = apply_long_schema(self._df.reset_index())
+            stage.update(RunProfiler.size(self._df))
+
+        with self._profiler.stage("transform", **RunProfiler.size(self._df)):
+            if self._kind == "caseload":
+                df = tableau_datasets_caseload.transform_caseload_long(self._df)
+            elif self._kind == "financial":
+                df = tableau_datasets_financial.transform_financial_long(
+                    self._df, self._inflation
+                )
+
+        path = os.path.join(self._dest, f"{self._kind.title()}DataLong.xlsx")
+        with self._profiler.stage(
+            "export long",
+            workbook=os.path.basename(path),
+            **RunProfiler.size(df),
+        ):
+            df.to_excel(path, sheet_name=f"{self._kind.title()}Data", index=False)
+        with self._profiler.stage("long store", **RunProfiler.size(df)):
+            write_long_store(df, path.replace(".xlsx", ".parquet"))
 
     def generate(self):
         """Call generate_wide_data and generate_long_data"""
 
-        self.generate_wide_data()
-        self.generate_long_data()
+        try:
+            self.generate_wide_data()
+            self.generate_long_data()
+        finally:
+            self.workbooks.clear()
+
+        if self._profiler.enabled:
+            current_date = time.strftime("%Y%m%d", time.gmtime())
+            self._profiler.export(
+                self.profile_directory(),
+                f"{self._kind.title()}TableauProfile_{current_date}",
+            )
+
+    @property
+    def workbooks(self):
+        """Cache of the workbooks read during the run, so that each is parsed once"""
+        if self._workbooks is None:
+            from otld.utils.cache_utils import WorkbookCache
+
+            self._workbooks = WorkbookCache()
+
+        return self._workbooks
+
+    @staticmethod
+    def size(frames: "dict[pd.DataFrame]") -> dict[int]:
+        """Total number of rows and cells in a dictionary of data frames"""
+        return {
+            "rows": sum(df.shape[0] for df in frames.values()),
+            "cells": sum(int(df.size) for df in frames.values()),
+        }
+
+    def profile_directory(self) -> str:
+        """Directory in which to save the run report"""
+        if self._profile:
+            return self._profile
+        elif os.path.isdir(diagnostics_dir):
+            return diagnostics_dir
+
+        return self._dest
 
 
 def main():
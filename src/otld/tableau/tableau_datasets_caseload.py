@@ -1,6 +1,5 @@
 """Module for caseload Tableau-specific datasets"""
 
-import math
 import os
 
 import numpy as np
@@ -34,45 +33,51 @@ def transform_caseload_long(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Transformed caseload dataset
     """
-    df["log_value"] = df["Number"].map(
-        lambda x: math.log(x, 10) if isinstance(x, (float, int)) and x != 0 else None
-    )
+    df = df.reset_index(drop=True)
+    number = df["Number"].to_numpy(dtype="float64", na_value=np.nan)
+
+    # Log of positive values
+    log_value = np.full(len(number), np.nan)
+    np.log10(number, out=log_value, where=number > 0)
+    df["log_value"] = log_value
+
+    # Classify each distinct category once, then expand to the rows through the codes
+    codes, categories = pd.factorize(df["Category"])
+    categories = pd.Index(np.asarray(categories, dtype=object)).str.lower()
+    family = categories.str.contains("fam", regex=False)[codes]
+    is_total = categories.str.contains("total", regex=False)[codes]
 
     # Calculate percentage of total
-    df["group"] = df["Category"].apply(
-        lambda x: "family" if x.lower().find("fam") > -1 else "recipients"
+    group = pd.Series(np.where(family, "family", "recipients"), index=df.index)
+    total = (
+        df["Number"]
+        .where(is_total)
+        .groupby(
+            [df["FiscalYear"], df["State"], df["Funding"], group],
+            observed=True,
+            dropna=False,
+        )
+        .transform("first")
     )
-    total = df[df["Category"].apply(lambda x: x.lower().find("total") > -1)]
-    total = total[["FiscalYear", "State", "Funding", "group", "Number"]].rename(
-        columns={"Number": "Total"}
-    )
-    df = df.merge(total, how="left", on=["FiscalYear", "State", "Funding", "group"])
-    df["pct_of_total"] = round(df["Number"] / df["Total"], 4) * 100
+    df["pct_of_total"] = round(df["Number"] / total, 4) * 100
     df["pct_of_total"] = df["pct_of_total"].replace(
         [np.nan, np.inf, -np.inf], [0, 0, 0]
     )
-    df.drop(["Total", "group"], inplace=True, axis=1)
 
     # Deviation from base year
-    base_year = (
+    base = (
         df.sort_values(["FiscalYear", "State", "Funding", "Category"])
-        .groupby(["State", "Funding", "Category"])
-        .first()[["FiscalYear", "Number"]]
-        .rename(columns={"Number": "base"})
-        .reset_index()
+        .groupby(["State", "Funding", "Category"], observed=True)["Number"]
+        .transform("first")
     )
     # Confirm years are as expected
     # Commented out because tests fail when this line is included and any appended file missing
     # these early years would also fail
     # assert all([year in [2000, 1997] for year in base_year["FiscalYear"]])
-    base_year.drop("FiscalYear", axis=1, inplace=True)
-
-    df = df.merge(base_year, how="left", on=["State", "Funding", "Category"])
-    df["pct_deviation"] = round(df["Number"] / df["base"], 4) * 100
+    df["pct_deviation"] = round(df["Number"] / base, 4) * 100
     df["pct_deviation"] = df["pct_deviation"].replace(
         [np.nan, np.inf, -np.inf], [0, 0, 0]
     )
-    df.drop("base", inplace=True, axis=1)
 
     return df
 
@@ -9,53 +9,29 @@ from otld.paths import inter_dir, out_dir, tableau_dir
 from otld.utils import excel_to_dict, export_workbook, wide_with_index
 from otld.utils.consolidation import CONSOLIDATION_MAP
 from otld.utils.crosswalk_dict import crosswalk_dict
+from otld.utils.inflation import fiscal_year_index, inflation_adjust, read_deflator
+from otld.utils.schema import apply_long_schema, map_categories
 
+# Lines whose sum is the total of TANF funds awarded
+AWARDED_CATEGORIES = [
+    "24. Total Expenditures",
+    "2. Transfers to Child Care and Development Fund (CCDF) Discretionary",
+    "3. Transfers to Social Services Block Grant (SSBG)",
+]
 
-def calculate_pce(path: str, base_year: int) -> pd.DataFrame:
-    """Output a base_pce as well as calculate pce for every federal fiscal year.
+
+def calculate_pce(path: str) -> pd.DataFrame:
+    """Calculate pce for every federal fiscal year.
 
     Args:
         path (str): Path to PCE csv
-        base_year (int): The year to which to scale inflation adjusted dollars
 
     Returns:
         pd.DataFrame: Data frame with pce calculated
     """
-    global base_pce
-
-    # Read in PCE
-    df = pd.read_csv(path).rename(columns={"year": "Year"})
-    df.set_index("Year", inplace=True)
-
-    def calculate(row: pd.Series):
-        try:
-            index = (
-                row[
-                    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep"]
-                ].sum()
-                + df.loc[row.name - 1, ["Oct", "Nov", "Dec"]].sum()
-            ) / 12
-            return index
-        except KeyError:
-            return np.nan
-
-    df["pce"] = df.apply(calculate, axis=1)
-    base_pce = df.loc[base_year, "pce"]
+    pce = fiscal_year_index(read_deflator(path))
 
-    return df.reset_index()[["Year", "pce"]]
-
-
-def inflation_adjust(row: pd.Series) -> float:
-    """Adjust amount for inflation
-
-    Args:
-        row (pd.Series): One expenditure entry.
-
-    Returns:
-        float: Inflation adjusted expenditure.
-    """
-    adjusted = row["Amount"] * base_pce / row["pce"]
-    return adjusted
+    return pce.rename("pce").reset_index()
 
 
 def get_consolidated_column(column: str, map: dict) -> str:
@@ -99,61 +75,48 @@ def transform_financial_long(df: pd.DataFrame, pce_path: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Tableau-ready dataframe.
     """
-    # Line Crosswalk
-    crosswalk = pd.DataFrame.from_dict(crosswalk_dict, orient="index")
-    crosswalk["Category"] = crosswalk.apply(lambda x: f"{x.name}. {x["name"]}", axis=1)
-    crosswalk = crosswalk[["Category", "description"]]
+    df = apply_long_schema(df).reset_index(drop=True)
+
+    # Line description, looked up once per category
+    descriptions = {
+        f"{key}. {value["name"]}": value.get("description", np.nan)
+        for key, value in crosswalk_dict.items()
+    }
+    df["description"] = map_categories(df["Category"], descriptions)
 
     # Percentage of TANF Funds
-    df = df.merge(crosswalk, how="left", on="Category")
-    awarded = (
-        df[
-            df["Category"].map(
-                lambda x: x
-                in [
-                    "24. Total Expenditures",
-                    "2. Transfers to Child Care and Development Fund (CCDF) Discretionary",
-                    "3. Transfers to Social Services Block Grant (SSBG)",
-                ]
-            )
-        ]
-        .groupby(["State", "FiscalYear", "Funding"])
-        .sum(["Amount"])
-        .rename(columns={"Amount": "Total"})
-    )
-    df = df.merge(
-        awarded,
-        how="left",
-        on=["State", "FiscalYear", "Funding"],
-    )
-    df["pct_of_tanf"] = (round(df["Amount"] / df["Total"], 4) * 100).replace(
+    awarded = df["Amount"].where(df["Category"].isin(AWARDED_CATEGORIES))
+    awarded = awarded.groupby(
+        [df["State"], df["FiscalYear"], df["Funding"]], observed=True, sort=False
+    ).transform("sum")
+    df["pct_of_tanf"] = (round(df["Amount"] / awarded, 4) * 100).replace(
         [np.nan, np.inf, -np.inf], [0, 0, 0]
     )
-    df.drop("Total", inplace=True, axis=1)
 
     # Percentage of total
-    total = df.loc[
-        df["Funding"] == "Total",
-        ["State", "FiscalYear", "Category", "Amount"],
-    ].rename(columns={"Amount": "Total"})
-    df = df.merge(total, how="left", on=["State", "FiscalYear", "Category"])
-    df["pct_of_total"] = (round(df["Amount"] / df["Total"], 4) * 100).replace(
+    total = df["Amount"].where(df["Funding"] == "Total")
+    total = total.groupby(
+        [df["State"], df["FiscalYear"], df["Category"]],
+        observed=True,
+        sort=False,
+        dropna=False,
+    ).transform("first")
+    df["pct_of_total"] = (round(df["Amount"] / total, 4) * 100).replace(
         [np.nan, np.inf, -np.inf], [0, 0, 0]
     )
-    df.drop("Total", inplace=True, axis=1)
 
     # Add inflation adjusted amount
-    pce = calculate_pce(pce_path, df["FiscalYear"].max())
-    df = df.merge(pce, how="left", left_on="FiscalYear", right_on="Year")
-    df["InflationAdjustedAmount"] = df.apply(inflation_adjust, axis=1)
-    df.drop(["Year", "pce"], inplace=True, axis=1)
+    pce = calculate_pce(pce_path).set_index("Year")["pce"]
+    df["InflationAdjustedAmount"] = inflation_adjust(
+        df["Amount"], df["FiscalYear"], pce, df["FiscalYear"].max()
+    )
 
     # Add column indicating which consolidated variable is associated
-    df["consolidated_column"] = df["Category"].map(
-        lambda x: get_consolidated_column(x, CONSOLIDATION_MAP)
+    df["consolidated_column"] = map_categories(
+        df["Category"], lambda x: get_consolidated_column(x, CONSOLIDATION_MAP)
     )
 
-    return df
+    return apply_long_schema(df)
 
 
 def generate_long_data():
@@ -0,0 +1,121 @@
+"""Class to match worksheet headers to canonical column names"""
+
+import re
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# Characters replaced with whitespace before comparing headers
+NON_ALPHANUMERIC = re.compile(r"(?ui)\W")
+
+
+def normalize(header: str) -> str:
+    """Normalize a header for comparison
+
+    Characters other than letters and numbers are replaced with whitespace, and the
+    result is lower cased and stripped, as fuzzywuzzy's full_process does.
+
+    Args:
+        header (str): Header to normalize.
+
+    Returns:
+        str: Normalized header.
+    """
+    return NON_ALPHANUMERIC.sub(" ", header).lower().strip()
+
+
+class HeaderMatcher:
+    """Match worksheet headers to canonical column names
+
+    Headers are matched, in order of preference, to a name that is identical, a name
+    that is identical after normalization, or the most similar name whose similarity
+    rounds to 100%. Similarity is fuzzywuzzy's ratio of normalized headers. Ties are
+    broken by the order of the canonical names. Results are memoized, so headers
+    repeated across sheets and years are only matched once.
+    """
+
+    # Matchers built so far, by canonical names
+    _matchers = {}
+
+    def __init__(self, names: list[str], score: int = 100):
+        """Index canonical names
+
+        Args:
+            names (list[str]): Canonical column names.
+            score (int, optional): Minimum similarity score (0-100) of a match.
+            Defaults to 100.
+        """
+        self.names = list(names)
+        self.score = score
+        self._normalized = [normalize(name) for name in self.names]
+        self._lengths = np.array([len(name) for name in self._normalized])
+
+        # First canonical name for each exact and normalized name
+        self._exact = {}
+        self._index = {}
+        for name, normalized in zip(self.names, self._normalized):
+            self._exact.setdefault(name, name)
+            self._index.setdefault(normalized, name)
+
+        self._cache = {}
+
+    @classmethod
+    def for_names(cls, names: list[str]) -> "HeaderMatcher":
+        """Get the matcher for a list of canonical names, building it only once
+
+        Args:
+            names (list[str]): Canonical column names.
+
+        Returns:
+            HeaderMatcher: Matcher for the names.
+        """
+        key = tuple(names)
+        if key not in cls._matchers:
+            cls._matchers[key] = cls(key)
+
+        return cls._matchers[key]
+
+    def match(self, header: str) -> str | None:
+        """Match a header to a canonical name
+
+        Args:
+            header (str): Header to match.
+
+        Returns:
+            str | None: Matching canonical name, or None if there is no match.
+        """
+        if header not in self._cache:
+            self._cache[header] = self._match(header)
+
+        return self._cache[header]
+
+    def _match(self, header: str) -> str | None:
+        if header in self._exact:
+            return self._exact[header]
+
+        normalized = normalize(header)
+        if normalized in self._index:
+            return self._index[normalized]
+
+        return self._similar(normalized)
+
+    def _similar(self, normalized: str) -> str | None:
+        """Find the most similar canonical name
+
+        The ratio of two strings is at most 2 * min(lengths) / sum(lengths), so
+        names whose length rules out a match are skipped without comparing them.
+        """
+        if not normalized:
+            return None
+
+        length = len(normalized)
+        bound = 2 * np.minimum(self._lengths, length) / (self._lengths + length)
+        candidates = np.flatnonzero(np.round(100 * bound) >= self.score)
+
+        best, best_ratio = None, 0
+        for i in candidates:
+            ratio = SequenceMatcher(None, normalized, self._normalized[i]).ratio()
+            if int(round(100 * ratio)) >= self.score and ratio > best_ratio:
+                best, best_ratio = self.names[i], ratio
+
+        return best
@@ -0,0 +1,164 @@
+"""Class to record stage-level timings and memory usage of a run"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+# pandas is only needed to export a report, so it is not loaded with the profiler
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def peak_rss() -> int:
+    """Peak resident set size of the current process in bytes
+
+    Returns:
+        int: The high-water mark of the process's resident memory.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters),
+            counters.cb,
+        )
+        return counters.PeakWorkingSetSize
+
+    import resource
+
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RunProfiler:
+    """Class to record stage-level timings and memory usage of a run
+
+    Stages are recorded with RunProfiler.stage. When the profiler is disabled, stages
+    are not timed and nothing is recorded, so instrumented code can call it
+    unconditionally.
+    """
+
+    def __init__(self, command: str = "", enabled: bool = True):
+        """Initialize RunProfiler
+
+        Args:
+            command (str, optional): Name of the command being profiled. Defaults to "".
+            enabled (bool, optional): Whether to record stages. Defaults to True.
+        """
+        self._command = command
+        self._enabled = enabled
+        self._stages = []
+        self._started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._start = time.perf_counter()
+
+    @property
+    def command(self):
+        """Name of the command being profiled"""
+        return self._command
+
+    @property
+    def enabled(self):
+        """Boolean indicating whether stages are recorded"""
+        return self._enabled
+
+    @property
+    def stages(self):
+        """List of recorded stages"""
+        return self._stages
+
+    @staticmethod
+    def size(df: "pd.DataFrame") -> dict[int]:
+        """Number of rows and cells in a data frame
+
+        Args:
+            df (pd.DataFrame): Data frame processed by a stage.
+
+        Returns:
+            dict[int]: Dictionary with keys rows and cells.
+        """
+        return {"rows": df.shape[0], "cells": int(df.size)}
+
+    @contextmanager
+    def stage(self, name: str, level: str = None, workbook: str = None, **details):
+        """Record the wall time and peak memory of a stage
+
+        Yields a dictionary to which the stage can add details, such as the number of
+        rows and cells it processed (see RunProfiler.size).
+
+        Args:
+            name (str): Name of the stage.
+            level (str, optional): Funding level being processed. Defaults to None.
+            workbook (str, optional): Workbook being processed. Defaults to None.
+            details: Any additional details to record, e.g. the worksheet name.
+        """
+        record = {"stage": name, "level": level, "workbook": workbook, **details}
+        if not self._enabled:
+            yield record
+            return
+
+        before = peak_rss()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 4)
+            after = peak_rss()
+            record["peak_rss_mb"] = round(after / 2**20, 1)
+            record["rss_growth_mb"] = round((after - before) / 2**20, 1)
+            self._stages.append(record)
+
+    def report(self) -> dict:
+        """Build the run report
+
+        Returns:
+            dict: Summary of the run and a list of its stages.
+        """
+        return {
+            "command": self._command,
+            "started": self._started,
+            "seconds": round(time.perf_counter() - self._start, 4),
+            "peak_rss_mb": round(peak_rss() / 2**20, 1),
+            "stages": self._stages,
+        }
+
+    def export(self, directory: str, name: str) -> None:
+        """Export the run report as JSON and as a diagnostics workbook
+
+        Args:
+            directory (str): Directory in which to save the report.
+            name (str): File name of the report, without extension.
+        """
+        import pandas as pd
+
+        report = self.report()
+        with open(os.path.join(directory, f"{name}.json"), "w") as file:
+            json.dump(report, file, indent=2)
+
+        columns = ["stage", "level", "workbook", "seconds", "rows", "cells"]
+        df = pd.DataFrame(report["stages"])
+        df = df.reindex(columns=[*columns, *df.columns.drop(columns, errors="ignore")])
+        df.to_excel(
+            os.path.join(directory, f"{name}.xlsx"), sheet_name="Profile", index=False
+        )
@@ -0,0 +1,91 @@
+"""Class to open an Excel workbook once and serve all of its sheets"""
+
+import os
+
+import openpyxl
+import pandas as pd
+from openpyxl.worksheet.worksheet import Worksheet
+
+from otld.utils.openpyxl_utils import get_column_names, get_non_empty_columns
+
+
+class WorkbookSession:
+    """Open an Excel workbook once and serve the cells and data of its sheets
+
+    The workbook is loaded with openpyxl a single time. Header detection works on its
+    cells (including merged ranges) and pandas reads data from the same loaded
+    workbook, so no sheet is parsed more than once however many are requested.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        """Load the workbook
+
+        Args:
+            path (str | os.PathLike): Path to an xlsx workbook.
+        """
+        self.path = path
+        self.name = os.path.split(path)[1]
+        # Not read_only: read-only worksheets do not expose merged cells. data_only
+        # reads the cached values of formulas, as pd.read_excel does, rather than
+        # the formulas themselves.
+        self.workbook = openpyxl.load_workbook(path, data_only=True)
+        self._excel = pd.ExcelFile(self.workbook, engine="openpyxl")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        """Names of the sheets in the workbook"""
+        return self._excel.sheet_names
+
+    def worksheet(self, sheet: str) -> Worksheet:
+        """Get the cells of a sheet
+
+        Args:
+            sheet (str): Sheet name.
+
+        Returns:
+            Worksheet: openpyxl worksheet.
+        """
+        return self.workbook[sheet]
+
+    def read_excel(self, sheet: str, **kwargs) -> pd.DataFrame:
+        """Read a sheet into a data frame
+
+        Args:
+            sheet (str): Sheet name.
+            **kwargs: Keyword arguments passed to pd.read_excel.
+
+        Returns:
+            pd.DataFrame: Data frame of the sheet.
+        """
+        return pd.read_excel(self._excel, sheet_name=sheet, **kwargs)
+
+    def read_table(self, sheet: str) -> pd.DataFrame:
+        """Read a sheet whose column names may span several header rows
+
+        Empty columns are skipped and the column names are found with
+        get_column_names.
+
+        Args:
+            sheet (str): Sheet name.
+
+        Returns:
+            pd.DataFrame: Data in the rows below the header, with column names.
+        """
+        worksheet = self.worksheet(sheet)
+        usecols = get_non_empty_columns(worksheet)
+        columns, i = get_column_names(worksheet, usecols)
+
+        df = self.read_excel(sheet, skiprows=i, header=None, usecols=usecols)
+        df.columns = columns
+
+        return df
+
+    def close(self):
+        """Close the workbook"""
+        self._excel.close()
@@ -1,9 +1,52 @@
-"""Utility modules"""
-
-from .checks import FinancialDataChecker
-from .openpyxl_utils import *
-from .pandas_utils import *
-from .states import STATES
-from .string_utils import *
-from .tableau_utils import *
-from .validate_data_frame import validate_data_frame
+"""Utility modules
+
+Names re-exported here are imported from their modules on first access, so that
+importing a utility module (e.g. otld.utils.tkinter_utils) does not load pandas,
+openpyxl and the other data dependencies.
+"""
+
+import importlib
+
+# Module defining each re-exported name
+_EXPORTS = {
+    "FinancialDataChecker": "checks",
+    "STATES": "states",
+    # openpyxl_utils.__all__
+    "delete_empty_columns": "openpyxl_utils",
+    "get_non_empty_columns": "openpyxl_utils",
+    "merged_cell_index": "openpyxl_utils",
+    "get_merged_value": "openpyxl_utils",
+    "get_column_names": "openpyxl_utils",
+    "export_workbook": "openpyxl_utils",
+    "long_notes": "openpyxl_utils",
+    # pandas_utils.__all__
+    "convert_to_numeric": "pandas_utils",
+    "get_header": "pandas_utils",
+    "excel_to_dict": "pandas_utils",
+    # string_utils.__all__
+    "standardize_file_name": "string_utils",
+    "standardize_line_number": "string_utils",
+    # tableau_utils.__all__
+    "wide_with_index": "tableau_utils",
+}
+
+
+def __getattr__(name: str):
+    """Import re-exported names on first access"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Cache the name so that later lookups do not go through __getattr__
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
+
+
+# Bound when the package loads, so that importing the module of the same name later
+# does not replace the function
+from .validate_data_frame import validate_data_frame  # noqa: E402
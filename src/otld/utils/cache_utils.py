@@ -0,0 +1,354 @@
+"""Utilities for caching parsed data on disk and in memory"""
+
+__all__ = ["hash_file", "code_version", "ParseCache", "WorkbookCache"]
+
+import hashlib
+import inspect
+import marshal
+import os
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Size of the chunks read when hashing a file
+CHUNK_SIZE = 2**20
+
+# Key of the attrs in which ParseCache stores column labels that are not strings
+COLUMN_LABELS = "otld_column_labels"
+
+# Memory budget and number of open workbooks of a WorkbookCache
+MAX_BYTES = 2**28
+MAX_WORKBOOKS = 8
+
+
+def hash_file(path: str | os.PathLike) -> str:
+    """Compute the SHA-256 digest of a file's contents
+
+    Args:
+        path (str | os.PathLike): Path to the file to hash.
+
+    Returns:
+        str: Hexadecimal digest of the file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def code_version(*functions: Callable) -> str:
+    """Version that changes whenever the code of any of the functions changes
+
+    The source of each function is hashed. Where the source is not available, e.g.
+    in frozen executables, its compiled code is hashed instead.
+
+    Args:
+        functions (Callable): Functions whose output is cached.
+
+    Returns:
+        str: Hexadecimal digest of the functions' code.
+    """
+    digest = hashlib.sha256()
+    for function in functions:
+        try:
+            digest.update(inspect.getsource(function).encode())
+        except (OSError, TypeError):
+            digest.update(marshal.dumps(function.__code__))
+
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Content-addressed on-disk cache of parsed worksheets
+
+    Entries are keyed by the hash of the source file's bytes, the sheet name and a
+    parser version, so a renamed or moved file still hits the cache while any edit to
+    the file, or a change to the parsing code, misses it.
+
+    Frames are stored as Parquet, which does not depend on the installed pandas
+    version and does not run code when loaded. Column labels that are not strings
+    are restored when loaded. Frames Parquet cannot store, e.g. with columns of mixed
+    types, are not cached.
+    """
+
+    def __init__(self, directory: str | os.PathLike, version: str):
+        """Initialize ParseCache
+
+        Args:
+            directory (str | os.PathLike): Directory in which to store cached frames.
+            Created if it does not exist.
+            version (str): Parser version, e.g. from code_version, which must change
+            whenever parsing logic changes so that stale entries are ignored.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._version = version
+        self._hashes = {}
+
+    @property
+    def directory(self):
+        """Directory containing cached frames"""
+        return self._directory
+
+    @property
+    def version(self):
+        """Parser version included in every cache key"""
+        return self._version
+
+    def file_hash(self, path: str | os.PathLike) -> str:
+        """Hash a file, reusing the digest if the file is unchanged since last hashed
+
+        Args:
+            path (str | os.PathLike): Path to the file to hash.
+
+        Returns:
+            str: Hexadecimal digest of the file's contents.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        path = os.path.abspath(path)
+
+        if path not in self._hashes or self._hashes[path][0] != signature:
+            self._hashes[path] = (signature, hash_file(path))
+
+        return self._hashes[path][1]
+
+    def key(self, path: str | os.PathLike, *parts: str) -> str:
+        """Build the cache key for a file and any additional identifying parts
+
+        Args:
+            path (str | os.PathLike): Path to the source file.
+            parts (str): Additional key components, e.g. the data type and sheet name.
+
+        Returns:
+            str: Hexadecimal cache key.
+        """
+        components = [self.file_hash(path), self._version, *map(str, parts)]
+        return hashlib.sha256("\x1f".join(components).encode()).hexdigest()
+
+    def location(self, key: str) -> str:
+        """Path at which the entry for `key` is stored"""
+        return os.path.join(self._directory, f"{key}.parquet")
+
+    def get(self, path: str | os.PathLike, *parts: str) -> pd.DataFrame | None:
+        """Retrieve a cached frame
+
+        Args:
+            path (str | os.PathLike): Path to the source file.
+            parts (str): Additional key components.
+
+        Returns:
+            pd.DataFrame | None: The cached frame, or None if there is no entry.
+        """
+        location = self.location(self.key(path, *parts))
+        if not os.path.exists(location):
+            return None
+
+        try:
+            df = pd.read_parquet(location)
+            columns = pq.read_schema(location).pandas_metadata["columns"]
+        except Exception:
+            # Treat unreadable entries (e.g. an interrupted write) as a miss
+            return None
+
+        # Parquet stores object columns of numbers as numbers, so restore them
+        restore = {
+            column["name"]: object
+            for column in columns
+            if column["numpy_type"] == "object" and column["name"] in df.columns
+        }
+        if restore:
+            df = df.astype(restore)
+
+        labels = df.attrs.pop(COLUMN_LABELS, None)
+        if labels is not None:
+            df.columns = pd.Index(labels, tupleize_cols=False)
+
+        return df
+
+    def set(self, path: str | os.PathLike, *parts: str, df: pd.DataFrame) -> None:
+        """Store a frame in the cache
+
+        Args:
+            path (str | os.PathLike): Path to the source file.
+            parts (str): Additional key components.
+            df (pd.DataFrame): Frame to store.
+        """
+        location = self.location(self.key(path, *parts))
+
+        # Write to a temporary file first so readers never see a partial entry
+        # Parquet column names must be strings, so other labels are kept in attrs
+        if not all(isinstance(label, str) for label in df.columns):
+            labels = df.columns.tolist()
+            df = df.set_axis(df.columns.map(str), axis=1)
+            df.attrs = {**df.attrs, COLUMN_LABELS: labels}
+
+        temporary = f"{location}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(temporary)
+        except (ValueError, TypeError, NotImplementedError):
+            # Parquet cannot store the frame, e.g. columns of mixed types
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            return
+
+        os.replace(temporary, location)
+
+
+class WorkbookCache:
+    """Run-scoped in-memory cache of open workbooks and parsed worksheets
+
+    A cache is created for a run and cleared when the run ends, which closes its
+    workbooks, so that files are not held open between runs.
+    Workbooks are keyed by their path, modification time and size, so a file that is
+    rewritten during the run is read again. Each workbook is opened once and each
+    worksheet is parsed once per set of read_excel arguments. Least recently used
+    worksheets are evicted once the cache exceeds its memory budget, and least
+    recently used workbooks are closed once more than MAX_WORKBOOKS are open.
+
+    Every consumer receives its own copy of a worksheet, which is shallow when pandas
+    copy-on-write is enabled, so modifying it does not affect the cache.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, max_workbooks: int = MAX_WORKBOOKS):
+        """Initialize WorkbookCache
+
+        Args:
+            max_bytes (int, optional): Memory budget of the parsed worksheets, in
+            bytes. Defaults to MAX_BYTES.
+            max_workbooks (int, optional): Number of workbooks kept open. Defaults to
+            MAX_WORKBOOKS.
+        """
+        self._max_bytes = max_bytes
+        self._max_workbooks = max_workbooks
+        self._workbooks = OrderedDict()
+        self._sheets = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_bytes(self):
+        """Memory budget of the parsed worksheets, in bytes"""
+        return self._max_bytes
+
+    @property
+    def nbytes(self):
+        """Memory used by the parsed worksheets, in bytes"""
+        return self._nbytes
+
+    @property
+    def hits(self):
+        """Number of worksheets served from the cache"""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of worksheets parsed"""
+        return self._misses
+
+    @staticmethod
+    def key(path: str | os.PathLike) -> tuple:
+        """Key of a workbook: its absolute path, modification time and size"""
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    def excel_file(self, path: str | os.PathLike) -> pd.ExcelFile:
+        """Get the open workbook at a path, opening it if needed
+
+        Args:
+            path (str | os.PathLike): Path to the workbook.
+
+        Returns:
+            pd.ExcelFile: Open workbook. It is closed by the cache, not the caller.
+        """
+        key = self.key(path)
+        if key in self._workbooks:
+            self._workbooks.move_to_end(key)
+            return self._workbooks[key]
+
+        # Drop any previous version of the file
+        self.evict(key[0])
+
+        self._workbooks[key] = pd.ExcelFile(path)
+        while len(self._workbooks) > self._max_workbooks:
+            _, workbook = self._workbooks.popitem(last=False)
+            workbook.close()
+
+        return self._workbooks[key]
+
+    def sheet_names(self, path: str | os.PathLike) -> list[str]:
+        """Names of the worksheets of a workbook"""
+        return self.excel_file(path).sheet_names
+
+    def read_excel(
+        self, path: str | os.PathLike, sheet_name: str | int | None = 0, **kwargs
+    ) -> pd.DataFrame | dict[pd.DataFrame]:
+        """Read worksheets as pd.read_excel does, parsing each only once
+
+        Args:
+            path (str | os.PathLike): Path to the workbook.
+            sheet_name (str | int | None, optional): Name or position of the
+            worksheet, or None for every worksheet. Defaults to 0.
+            kwargs: Any other arguments to read_excel.
+
+        Returns:
+            pd.DataFrame | dict[pd.DataFrame]: Worksheet, or every worksheet keyed by
+            name if sheet_name is None.
+        """
+        workbook = self.excel_file(path)
+        if sheet_name is None:
+            return {
+                sheet: self.read_excel(path, sheet, **kwargs)
+                for sheet in workbook.sheet_names
+            }
+        if isinstance(sheet_name, int):
+            sheet_name = workbook.sheet_names[sheet_name]
+
+        key = (self.key(path), sheet_name, repr(sorted(kwargs.items())))
+        if key in self._sheets:
+            self._hits += 1
+            self._sheets.move_to_end(key)
+            df, _ = self._sheets[key]
+        else:
+            self._misses += 1
+            df = pd.read_excel(workbook, sheet_name=sheet_name, **kwargs)
+            self.store(key, df)
+
+        return df.copy(deep=pd.options.mode.copy_on_write is not True)
+
+    def store(self, key: tuple, df: pd.DataFrame) -> None:
+        """Store a parsed worksheet, evicting the least recently used ones
+
+        Worksheets larger than the memory budget are not stored.
+        """
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self._max_bytes:
+            return
+
+        self._sheets[key] = (df, nbytes)
+        self._nbytes += nbytes
+        while self._nbytes > self._max_bytes:
+            _, (_, evicted) = self._sheets.popitem(last=False)
+            self._nbytes -= evicted
+
+    def evict(self, path: str | os.PathLike) -> None:
+        """Drop every cached version of a workbook and its worksheets"""
+        path = os.path.abspath(path)
+        for key in [key for key in self._workbooks if key[0] == path]:
+            self._workbooks.pop(key).close()
+        for key in [key for key in self._sheets if key[0][0] == path]:
+            _, nbytes = self._sheets.pop(key)
+            self._nbytes -= nbytes
+
+    def clear(self) -> None:
+        """Close every workbook and drop every worksheet"""
+        for workbook in self._workbooks.values():
+            workbook.close()
+        self._workbooks.clear()
+        self._sheets.clear()
+        self._nbytes = 0
@@ -9,6 +9,7 @@ import pandas as pd
 from openpyxl.styles.numbers import BUILTIN_FORMATS
 
 from otld.utils import get_header, long_notes
+from otld.utils.cache_utils import WorkbookCache
 
 OUTPUT_COLUMNS = [
     "FiscalYear",
@@ -113,9 +114,7 @@ def analyze_guam_data(df: pd.DataFrame) -> pd.DataFrame:
     return guam_data
 
 
-def process_1997_1998_1999_data(
-    year: int, df: pd.DataFrame, master_wide: pd.DataFrame
-) -> tuple:
+def process_1997_1998_1999_data(year: int, df: pd.DataFrame) -> pd.DataFrame:
     """Process data for years 1997-1999, preserving original value representations."""
     try:
         if year == 1997:
@@ -162,7 +161,11 @@ def process_1997_1998_1999_data(
 
 
 def process_sheet(
-    file_path: str, sheet_name: str, column_names: List[str], year: int
+    file_path: str,
+    sheet_name: str,
+    column_names: List[str],
+    year: int,
+    cache: Optional[WorkbookCache] = None,
 ) -> Optional[pd.DataFrame]:
     """Load caseload worksheet
 
@@ -172,16 +175,19 @@ def process_sheet(
         skiprows (int): Number of rows to skip
         column_names (List[str]): Names to assign to columns
         year (int): Fiscal year associated with caseload data
+        cache (Optional[WorkbookCache]): Cache of the run from which to read the
+        worksheet. Defaults to None (read the workbook directly).
 
     Returns:
         Optional[pd.DataFrame]: Data frame
     """
+    read_excel = pd.read_excel if cache is None else cache.read_excel
     try:
         is_old_format = year <= 2020
 
         if is_old_format:
             # Handling for older formats (2000-2020)
-            df = pd.read_excel(
+            df = read_excel(
                 file_path,
                 sheet_name=sheet_name,
                 skiprows=5,  # Skip rows for old format
@@ -209,7 +215,7 @@ def process_sheet(
                 ]
         else:
             # Handling for standard format (2021+)
-            df = pd.read_excel(
+            df = read_excel(
                 file_path,
                 sheet_name=sheet_name,
                 names=column_names,
@@ -364,9 +370,12 @@ def format_final_dataset(
 
 
 def extract_missing_average(
-    path: str, average: str, generate: bool = False
+    path: str,
+    average: str,
+    generate: bool = False,
+    cache: Optional[WorkbookCache] = None,
 ) -> pd.Series:
-    workbook = pd.ExcelFile(path)
+    workbook = pd.ExcelFile(path) if cache is None else cache.excel_file(path)
     sheet_names = workbook.sheet_names
 
     parameters = {
@@ -404,7 +413,10 @@ def extract_missing_average(
     for sheet in sheet_names:
         sheet_clean = re.sub(r"\W|\s", "", sheet).lower()
         if sheet_regex.match(sheet_clean):
-            df = pd.read_excel(workbook, sheet_name=sheet)
+            if cache is None:
+                df = pd.read_excel(workbook, sheet_name=sheet)
+            else:
+                df = cache.read_excel(path, sheet_name=sheet)
             df = get_header(df)
             df = clean_dataset(df)
             # df.columns = df.columns.map(
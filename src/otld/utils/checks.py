@@ -5,7 +5,7 @@ import re
 
 import pandas as pd
 
-from otld.utils.crosswalk_2014_2015 import crosswalk_dict, map_columns
+from otld.utils.crosswalk_2014_2015 import get_crosswalk_dict, map_columns
 from otld.utils.openpyxl_utils import export_workbook
 
 
@@ -77,7 +77,7 @@ class FinancialDataChecker(GenericChecker):
     def names_to_lines(self):
         """Rename columns to 196R line numbers"""
         if self._kind == "196":
-            self._df = map_columns(self._df, crosswalk_dict)
+            self._df = map_columns(self._df, get_crosswalk_dict())
         elif self._kind == "196R":
             pass
         else:
@@ -87,6 +87,7 @@ class FinancialDataChecker(GenericChecker):
 
     def lines_to_names(self, df: pd.DataFrame):
         """Rename line numbers to human readable names"""
+        crosswalk_dict = get_crosswalk_dict()
 
         def get_name(line: str):
             entry = crosswalk_dict.get(line)
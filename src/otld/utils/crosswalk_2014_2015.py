@@ -5,18 +5,129 @@ import sys
 
 import pandas as pd
 
-from otld.paths import input_dir
+from otld.paths import cache_dir, input_dir
+from otld.utils.cache_utils import ParseCache
 
-try:
+# Directory in which the parsed crosswalk is kept between runs. It is specific to the
+# user, as cached frames are loaded without further checks.
+CACHE_DIR = os.path.join(cache_dir, "crosswalk")
+
+# Bump whenever get_crosswalk changes so that cached crosswalks are not reused
+CROSSWALK_VERSION = "1"
+
+_crosswalk = None
+_crosswalk_dict = None
+_consolidated_categories = None
+
+
+def crosswalk_path() -> str:
+    """Path to the Instruction Crosswalk, including in frozen executables"""
+    directory = input_dir
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
-        input_dir = os.path.join(os.path.dirname(__file__), "..", "..")
+        directory = os.path.join(os.path.dirname(__file__), "..", "..")
+
+    return os.path.join(directory, "Instruction Crosswalk.xlsx")
+
+
+def read_sheet(sheet_name: str, convert=None) -> pd.DataFrame | None:
+    """Read a sheet of the Instruction Crosswalk through the on-disk cache
+
+    The parsed sheet is cached on disk, keyed by the hash of the workbook, so later
+    runs skip Excel parsing until the workbook changes.
+
+    Args:
+        sheet_name (str): Name of the sheet to read.
+        convert (Callable[[pd.DataFrame], pd.DataFrame], optional): Function applied
+        to the sheet before it is cached. Defaults to None.
+
+    Returns:
+        pd.DataFrame | None: Parsed sheet, or None if the workbook does not exist.
+    """
+    path = crosswalk_path()
+    if not os.path.exists(path):
+        return None
+
+    try:
+        cache = ParseCache(CACHE_DIR, CROSSWALK_VERSION)
+    except OSError:
+        cache = None
+
+    df = cache.get(path, sheet_name) if cache else None
+    if df is None:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        if convert is not None:
+            df = convert(df)
+        try:
+            if cache:
+                cache.set(path, sheet_name, df=df)
+        except OSError:
+            pass
+
+    return df
+
+
+def get_crosswalk() -> pd.DataFrame:
+    """Get the crosswalk sheet of the Instruction Crosswalk
+
+    The workbook is only read on first use, through read_sheet.
+
+    Returns:
+        pd.DataFrame: Crosswalk between ACF-196 and ACF-196R as strings, or an empty
+        data frame if the workbook does not exist.
+    """
+    global _crosswalk
+
+    if _crosswalk is not None:
+        return _crosswalk
+
+    crosswalk = read_sheet("crosswalk", lambda df: df.fillna("").astype(str))
+    if crosswalk is None:
+        return pd.DataFrame()
+
+    _crosswalk = crosswalk
+    return _crosswalk
+
+
+def get_consolidated_categories() -> pd.DataFrame:
+    """Get the consolidated_categories sheet of the Instruction Crosswalk
+
+    The workbook is only read on first use, through read_sheet.
+
+    Returns:
+        pd.DataFrame: Consolidation instructions, as strings, and names, one category
+        per row, or an empty data frame if the workbook does not exist.
+    """
+    global _consolidated_categories
+
+    if _consolidated_categories is not None:
+        return _consolidated_categories
 
-    crosswalk = pd.read_excel(
-        os.path.join(input_dir, "Instruction Crosswalk.xlsx"), sheet_name="crosswalk"
+    # Instructions mix line numbers and lists of lines, so are stored as strings
+    consolidated_categories = read_sheet(
+        "consolidated_categories", lambda df: df.astype({"instructions": str})
     )
+    if consolidated_categories is None:
+        return pd.DataFrame()
 
-    crosswalk.fillna("", inplace=True)
-    crosswalk = crosswalk.astype(str)
+    _consolidated_categories = consolidated_categories
+    return _consolidated_categories
+
+
+def get_crosswalk_dict() -> dict:
+    """Get the crosswalk as a dictionary keyed by ACF-196R line
+
+    Returns:
+        dict: Dictionary mapping ACF-196R lines to their name, description and
+        ACF-196 equivalent(s), or an empty dictionary if the workbook does not exist.
+    """
+    global _crosswalk_dict
+
+    if _crosswalk_dict is not None:
+        return _crosswalk_dict
+
+    crosswalk = get_crosswalk()
+    if crosswalk.empty:
+        return {}
 
     crosswalk_dict = crosswalk.set_index(["196R"]).to_dict(orient="index")
     for key in crosswalk_dict:
@@ -29,9 +140,19 @@ try:
             crosswalk_dict[key][196] = None
         else:
             crosswalk_dict[key][196] = value_196
-except FileNotFoundError:
-    crosswalk = pd.DataFrame()
-    crosswalk_dict = {}
+
+    _crosswalk_dict = crosswalk_dict
+    return _crosswalk_dict
+
+
+def __getattr__(name: str):
+    """Load crosswalk and crosswalk_dict on first access"""
+    if name == "crosswalk":
+        return get_crosswalk()
+    elif name == "crosswalk_dict":
+        return get_crosswalk_dict()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def map_columns(df: pd.DataFrame, crosswalk_dict: dict) -> pd.DataFrame:
@@ -69,4 +190,4 @@ if __name__ == "__main__":
     current_dir = os.path.dirname(__file__)
     with open(os.path.join(current_dir, "crosswalk_dict.py"), "w") as file:
         file.write("crosswalk_dict = ")
-        file.write(json.dumps(crosswalk_dict, indent=4))
+        file.write(json.dumps(get_crosswalk_dict(), indent=4))
@@ -1,64 +1,129 @@
 """Common pandas utilities"""
 
-__all__ = ["reindex_state_year", "consolidate_categories"]
+__all__ = [
+    "state_year_order",
+    "reindex_state_year",
+    "consolidation_matrix",
+    "consolidate_categories",
+]
 
+import re
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 
+def state_year_order(index: pd.MultiIndex, total: str = "u.s. total") -> np.ndarray:
+    """Positions that sort an index with the U.S. total first in each block
+
+    A block is the set of rows sharing every level other than the state (e.g. a
+    fiscal year, or a funding level and fiscal year). Blocks keep the order of their
+    first row and rows within a block keep their order, except that U.S. total rows
+    come first.
+
+    Args:
+        index (pd.MultiIndex): Index with a level whose name contains "state".
+        total (str, optional): Lower case name of the U.S. total. Defaults to
+        "u.s. total".
+
+    Returns:
+        np.ndarray: Positions of the rows in canonical order.
+    """
+    level = [i for i, name in enumerate(index.names) if "state" in name.lower()][0]
+
+    # Rank U.S. totals first by comparing the distinct states only
+    states = index.levels[level].str.lower() == total
+    is_total = states[index.codes[level]]
+
+    # Codes are assigned in order of first appearance, so they order the blocks
+    blocks, _ = index.droplevel(level).factorize()
+
+    return np.lexsort((~is_total, blocks))
+
+
 def reindex_state_year(
     df: pd.DataFrame, names: list[str] = ["STATE", "year"]
 ) -> pd.DataFrame:
     """Update the index of the data frame
 
+    Rows are put in canonical order with state_year_order.
+
     Args:
         df (pd.DataFrame): Data frame to update index of.
+        names (list[str], optional): Names of the updated index. Defaults to
+        ["STATE", "year"].
 
     Returns:
         pd.DataFrame: Data frame with updated index.
     """
-    # Convert index to list
-    index_list = df.index.to_list()
+    df = df.iloc[state_year_order(df.index)]
+    df.index.names = names
 
-    new_index = []
-    position = {}
+    return df
 
-    # Find where year and state are in index
-    for i, name in enumerate(df.index.names):
-        if name.lower().find("year") > -1:
-            year_pos = i
 
-        if name.lower().find("state") > -1:
-            state_pos = i
+@lru_cache
+def consolidation_matrix(
+    columns: tuple[str], instructions: tuple[tuple[str, str]]
+) -> tuple[list[str], np.ndarray]:
+    """Compile consolidation instructions into a line to category matrix
 
-    # Where in the list to move the U.S. Total index
-    for i, index in enumerate(index_list):
-        if index[state_pos].lower() == "alabama":
-            position[index[year_pos]] = i
-        elif index[state_pos].lower() == "u.s. total":
-            new_index.insert(position[index[year_pos]], index)
-            continue
+    Each instruction line is matched to the first column whose name starts with the
+    line number followed by a period.
 
-        new_index.append(index)
+    Args:
+        columns (tuple[str]): Columns of the data frame to consolidate.
+        instructions (tuple[tuple[str, str]]): Pairs of comma separated instruction
+        lines and consolidated category name.
+
+    Returns:
+        tuple[list[str], np.ndarray]: Matched columns, and a matrix with a row per
+        matched column and a column per category, that is 1 where the column is
+        summed into the category.
+    """
+    lines = []
+    matrix = []
+    for i, (instruction, _) in enumerate(instructions):
+        for line in str(instruction).split(","):
+            pattern = re.compile(rf"^{line}\.")
+            column = next((c for c in columns if pattern.search(c)), None)
+            if column is None:
+                continue
+            if column not in lines:
+                lines.append(column)
+                matrix.append(np.zeros(len(instructions), dtype="int8"))
+            matrix[lines.index(column)][i] += 1
 
-    # Reindex
-    new_index = pd.MultiIndex.from_tuples(new_index, names=names)
-    assert len(new_index) == df.shape[0]
-    df = df.reindex(new_index)
+    matrix = np.array(matrix, dtype="int8").reshape(len(lines), len(instructions))
 
-    return df
+    return lines, matrix
 
 
-def consolidate_categories(row: pd.Series, df: pd.DataFrame) -> None:
+def consolidate_categories(df: pd.DataFrame, instructions: pd.DataFrame) -> None:
     """Consolidate Funding categories (for visualization)
 
+    All categories are summed at once as the product of the data frame and the
+    compiled consolidation matrix, which is only built once per set of columns.
+
     Args:
-        row (pd.Series): Row containing consolidation instructions and new variable name.
         df (pd.DataFrame): DataFrame in which to create new columns.
+        instructions (pd.DataFrame): Consolidation instructions and new variable
+        names, one category per row.
     """
-
-    columns = str(row["instructions"]).split(",")
-    columns = [df.filter(regex=rf"^{column}\.").columns for column in columns]
-    columns = [column.tolist()[0] for column in columns if len(column) > 0]
-
-    df[row["name"]] = df[columns].sum(axis=1)
+    pairs = tuple(zip(instructions["instructions"], instructions["name"]))
+    lines, matrix = consolidation_matrix(tuple(map(str, df.columns)), pairs)
+
+    values = df[lines].to_numpy(dtype="float64", na_value=0)
+    totals = pd.DataFrame(
+        values @ matrix, index=df.index, columns=[name for _, name in pairs]
+    )
+
+    # Keep integer totals where every summed column is an integer
+    integer = [pd.api.types.is_integer_dtype(df[line]) for line in lines]
+    for j, name in enumerate(totals.columns):
+        summed = matrix[:, j] > 0
+        if summed.any() and all(np.array(integer)[summed]):
+            totals[name] = totals[name].astype("int64")
+
+    df[totals.columns] = totals
@@ -0,0 +1,91 @@
+"""Fiscal-year price indices and inflation adjustment
+
+Deflator series (PCE, CPI-U) are expected in wide format, with one row per calendar
+year and one column per month (Jan, Feb, ..., Dec), as produced by
+otld.utils.clean_pce.clean_pce.
+"""
+
+__all__ = ["MONTHS", "read_deflator", "fiscal_year_index", "inflation_adjust"]
+
+import numpy as np
+import pandas as pd
+
+MONTHS = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+
+# Last month of the federal fiscal year (September)
+FISCAL_YEAR_END = MONTHS.index("Sep")
+
+
+def read_deflator(path: str) -> pd.DataFrame:
+    """Read a wide monthly deflator series
+
+    Args:
+        path (str): Path to a csv with a year column and one column per month.
+
+    Returns:
+        pd.DataFrame: Data frame indexed by calendar year with one column per month.
+    """
+    df = pd.read_csv(path)
+    year = next(column for column in df.columns if str(column).lower() == "year")
+    df = df.rename(columns={year: "Year"}).set_index("Year")
+    df.columns = [str(column).strip().title()[:3] for column in df.columns]
+
+    return df
+
+
+def fiscal_year_index(df: pd.DataFrame) -> pd.Series:
+    """Average a monthly deflator over each federal fiscal year (October-September)
+
+    Args:
+        df (pd.DataFrame): Data frame indexed by calendar year with one column per
+        month.
+
+    Returns:
+        pd.Series: Index for each fiscal year. Fiscal years missing any month are NaN.
+    """
+    years = pd.RangeIndex(df.index.min(), df.index.max() + 1, name="Year")
+    monthly = df.reindex(index=years, columns=MONTHS).to_numpy(dtype=float).ravel()
+
+    # A 12-month window ending in September spans October through September
+    rolling = pd.Series(monthly).rolling(len(MONTHS)).mean().to_numpy()
+    index = rolling[FISCAL_YEAR_END :: len(MONTHS)]
+
+    return pd.Series(index, index=years, name="index")
+
+
+def inflation_adjust(
+    amount: pd.Series, year: pd.Series, index: pd.Series, base_year: int
+) -> pd.Series:
+    """Express amounts in base-year dollars
+
+    Args:
+        amount (pd.Series): Nominal amounts.
+        year (pd.Series): Fiscal year of each amount.
+        index (pd.Series): Price index by fiscal year, see fiscal_year_index.
+        base_year (int): The year to which to scale inflation adjusted dollars.
+
+    Returns:
+        pd.Series: Inflation adjusted amounts.
+
+    Raises:
+        ValueError: If the index has no value for the base year.
+    """
+    base = index.get(base_year, np.nan)
+    if pd.isna(base):
+        raise ValueError(f"Price index has no value for base year {base_year}")
+    deflator = year.astype(np.int64).map(index).astype(float)
+
+    return amount * base / deflator
@@ -0,0 +1,85 @@
+"""Utilities for storing long TANF data as partitioned Parquet"""
+
+__all__ = ["write_long_store", "read_long_store"]
+
+import os
+import shutil
+
+import pandas as pd
+
+from otld.utils.schema import apply_long_schema
+
+# Columns by which the store is partitioned into directories
+PARTITION_COLUMNS = ["Funding", "FiscalYear"]
+
+
+def write_long_store(df: pd.DataFrame, path: str) -> None:
+    """Write long data to a Parquet dataset partitioned by funding level and year
+
+    Files are laid out as `<path>/Funding=<level>/FiscalYear=<year>/*.parquet`, so
+    readers filtering on either column only open the matching files. Any existing
+    store at `path` is replaced.
+
+    Args:
+        df (pd.DataFrame): Long data frame with State, FiscalYear, Category and
+        Funding as columns or index levels.
+        path (str): Directory in which to write the store.
+    """
+    df = df.reset_index() if "State" in df.index.names else df
+
+    # Sort so that row group statistics can be used to skip states and categories
+    df = df.sort_values(["State", "Category"], kind="stable", ignore_index=True)
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+    df.to_parquet(path, partition_cols=PARTITION_COLUMNS, index=False)
+
+
+def read_long_store(
+    path: str,
+    states: list[str] = None,
+    years: tuple[int, int] = None,
+    funding: list[str] = None,
+    categories: list[str] = None,
+    columns: list[str] = None,
+) -> pd.DataFrame:
+    """Read a subset of a Parquet dataset written by write_long_store
+
+    Filters on funding and year prune whole partitions; filters on state and
+    category are pushed down to the Parquet reader.
+
+    Args:
+        path (str): Directory containing the store.
+        states (list[str], optional): States to include. Defaults to None (all).
+        years (tuple[int, int], optional): First and last fiscal year to include.
+        Defaults to None (all).
+        funding (list[str], optional): Funding levels to include. Defaults to None
+        (all).
+        categories (list[str], optional): Categories to include. Defaults to None
+        (all).
+        columns (list[str], optional): Columns to read. Defaults to None (all).
+
+    Returns:
+        pd.DataFrame: Long data with State and FiscalYear as the first columns and
+        the canonical long schema applied (see otld.utils.schema).
+    """
+    filters = []
+    if states is not None:
+        filters.append(("State", "in", list(states)))
+    if years is not None:
+        filters.extend([("FiscalYear", ">=", years[0]), ("FiscalYear", "<=", years[1])])
+    if funding is not None:
+        filters.append(("Funding", "in", list(funding)))
+    if categories is not None:
+        filters.append(("Category", "in", list(categories)))
+
+    df = pd.read_parquet(path, columns=columns, filters=filters or None)
+
+    # Partition columns are read as categories of strings
+    if "FiscalYear" in df.columns:
+        df["FiscalYear"] = df["FiscalYear"].astype(int)
+    df = apply_long_schema(df)
+
+    first = [column for column in ["State", "FiscalYear"] if column in df.columns]
+    return df[first + [column for column in df.columns if column not in first]]
@@ -5,11 +5,12 @@ import os
 import pandas as pd
 
 from otld.paths import diagnostics_dir
-from otld.utils.crosswalk_2014_2015 import crosswalk_dict
+from otld.utils.crosswalk_2014_2015 import get_crosswalk_dict
 
 
 def main(frames: dict):
     """Check combined workbook for missing columns"""
+    crosswalk_dict = get_crosswalk_dict()
     excel_writer = os.path.join(diagnostics_dir, "missingness.xlsx")
     if not os.path.exists(excel_writer):
         pd.DataFrame().to_excel(excel_writer, sheet_name="Federal")
@@ -2,19 +2,33 @@
 
 __all__ = [
     "delete_empty_columns",
+    "get_non_empty_columns",
+    "merged_cell_index",
     "get_merged_value",
     "get_column_names",
     "export_workbook",
     "long_notes",
 ]
 
+import warnings
+
 import openpyxl
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import numbers
 from openpyxl.styles.alignment import Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from openpyxl.worksheet.table import Table, TableStyleInfo
 from openpyxl.worksheet.worksheet import Worksheet
+from pandas.api.types import is_numeric_dtype
+
+# Width applied to every column of exported worksheets
+COLUMN_WIDTH = 25.0
+
+# Number of rows converted at a time when streaming a data frame to a worksheet
+CHUNK_ROWS = 2**16
 
 
 # Appropriated from Gemini code sample
@@ -42,27 +56,75 @@ def delete_empty_columns(
             worksheet.delete_cols(column)
 
 
-def get_merged_value(worksheet: Worksheet, cell: openpyxl.cell.cell.Cell) -> str:
+def get_non_empty_columns(worksheet: Worksheet) -> list[int]:
+    """Get the columns with at least one non-empty value
+
+    Unlike delete_empty_columns, this reads the worksheet once and does not modify
+    it. The result can be passed as usecols to pd.read_excel.
+
+    Args:
+        worksheet (Worksheet): Worksheet to search for non-empty columns.
+
+    Returns:
+        list[int]: Zero-based indices of the non-empty columns, in order.
+    """
+    non_empty = set()
+    for row in worksheet.iter_rows(values_only=True):
+        non_empty.update(j for j, value in enumerate(row) if value is not None)
+
+    return sorted(non_empty)
+
+
+def merged_cell_index(worksheet: Worksheet) -> dict[tuple[int, int], object]:
+    """Map every cell in a range of merged cells to the value of its first cell
+
+    Args:
+        worksheet (Worksheet): The worksheet to index.
+
+    Returns:
+        dict[tuple[int, int], object]: Dictionary mapping (row, column) of each merged
+        cell to the value of the first cell in its range.
+    """
+    index = {}
+    for merged_range in worksheet.merged_cells.ranges:
+        value = worksheet.cell(merged_range.min_row, merged_range.min_col).value
+        for row in range(merged_range.min_row, merged_range.max_row + 1):
+            for column in range(merged_range.min_col, merged_range.max_col + 1):
+                index[(row, column)] = value
+
+    return index
+
+
+def get_merged_value(
+    worksheet: Worksheet,
+    cell: openpyxl.cell.cell.Cell,
+    merged: dict[tuple[int, int], object] = None,
+) -> str:
     """Return the value in the first cell of a range of merged cells
 
     Args:
         worksheet (Worksheet): The worksheet to search in for merged cells.
         cell (openpyxl.cell.cell.Cell): The cell to check for in the merged cells.
+        merged (dict[tuple[int, int], object], optional): Index of merged cells built
+        by merged_cell_index. Pass one when looking up many cells in the same
+        worksheet. Defaults to None (search the worksheet's merged cells).
 
     Returns:
         str: The value of the first merged cell or the cell's value if it is not in a
         range of merged cells.
     """
-    merged_cells = list(worksheet.merged_cells)
-    for merged_cell in merged_cells:
-        if cell.coordinate in merged_cell:
-            first_cell = merged_cell.coord.split(":")[0]
-            return worksheet[first_cell].value
+    if merged is not None:
+        if (cell.row, cell.column) in merged:
+            return merged[(cell.row, cell.column)]
+    else:
+        for merged_range in worksheet.merged_cells.ranges:
+            if cell.coordinate in merged_range:
+                return worksheet.cell(merged_range.min_row, merged_range.min_col).value
 
     return cell.value if cell.value else ""
 
 
-def get_column_names(worksheet: Worksheet) -> list[str]:
+def get_column_names(worksheet: Worksheet, usecols: list[int] = None) -> list[str]:
     """Get the column names of an Excel worksheet
 
     This function iterates through the rows in an Excel worksheet until all columns
@@ -70,10 +132,13 @@ def get_column_names(worksheet: Worksheet) -> list[str]:
 
     Args:
         worksheet (Worksheet): An Excel worksheet.
+        usecols (list[int], optional): Zero-based indices of the columns to consider,
+        e.g. from get_non_empty_columns. Defaults to None (all columns).
 
     Returns:
         list[str]: A list of potential column names
     """
+    merged = merged_cell_index(worksheet)
     i = 0
     columns = []
     # If not all column names are present, concatenate current row with next
@@ -85,11 +150,12 @@ def get_column_names(worksheet: Worksheet) -> list[str]:
 
         if columns:
             columns = [
-                (column + " " + get_merged_value(worksheet, row[j])).strip()
-                for j, column in enumerate(columns)
+                (column + " " + get_merged_value(worksheet, row[j], merged)).strip()
+                for j, column in zip(indices, columns)
             ]
         else:
-            columns = [get_merged_value(worksheet, row[j]) for j in range(len(row))]
+            indices = range(len(row)) if usecols is None else usecols
+            columns = [get_merged_value(worksheet, row[j], merged) for j in indices]
 
         if all(columns):
             break
@@ -121,13 +187,20 @@ def set_column_widths(worksheet: Worksheet, column_width: int | list[int]) -> Wo
     return worksheet
 
 
-def add_table(ws: Worksheet, displayName: str, ref: str):
+def add_table(
+    ws: Worksheet | WriteOnlyWorksheet,
+    displayName: str,
+    ref: str,
+    columns: list[str] = None,
+):
     """Add an Excel table to a worksheet.
 
     Args:
-        ws (Worksheet): Worksheet to add table to.
+        ws (Worksheet | WriteOnlyWorksheet): Worksheet to add table to.
         displayName (str): Name of the table.
         ref (str): Range of cells to convert to a table.
+        columns (list[str], optional): Column headers of the table. Required for
+        write-only worksheets, whose header row cannot be read back. Defaults to None.
     """
     tab = Table(displayName=displayName, ref=ref)
 
@@ -136,7 +209,18 @@ def add_table(ws: Worksheet, displayName: str, ref: str):
     )
     tab.tableStyleInfo = style
 
-    ws.add_table(tab)
+    if columns is None:
+        ws.add_table(tab)
+        return
+
+    tab._initialise_columns()
+    for table_column, name in zip(tab.tableColumns, columns):
+        table_column.name = str(name)
+
+    with warnings.catch_warnings():
+        # Columns have been named above, so the write-only warning does not apply
+        warnings.simplefilter("ignore", UserWarning)
+        ws.add_table(tab)
 
 
 def format_openpyxl_worksheet(
@@ -153,7 +237,7 @@ def format_openpyxl_worksheet(
         column_letter = get_column_letter(column)
         column = ws.column_dimensions[column_letter]
         # Adjust width
-        column.width = 25.0
+        column.width = COLUMN_WIDTH
 
     # Align right
     for i, row in enumerate(ws.rows):
@@ -181,6 +265,7 @@ def export_workbook(
     drop: list[str] = [],
     format_options: dict = {},
     footnotes: dict[list[list]] = {},
+    streaming: bool = False,
 ):
     """Export a dictionary of data frames as an Excel Workbook.
 
@@ -188,19 +273,18 @@ def export_workbook(
         frames (dict): A dictionary of pandas DataFrames.
         path (str): The path at which to output the Excel workbook.
         drop (list[str], optional): List of columns to drop from the data frames. Defaults to [].
+        streaming (bool, optional): Write rows to disk as they are generated using
+        export_workbook_streaming. Defaults to False.
     """
+    if streaming:
+        return export_workbook_streaming(frames, path, drop, format_options, footnotes)
+
     # Load csv into workbook
     # Adapted from https://stackoverflow.com/questions/12976378/openpyxl-convert-csv-to-excel
     wb = openpyxl.Workbook()
     ws = wb.active
 
-    # If there are footnotes, then the keys should be a subset of frames.keys()
-    if footnotes:
-        frame_set = set(frames.keys())
-        note_set = set(footnotes.keys())
-        assert frame_set.issuperset(
-            note_set
-        ), f"All keys in footnotes ({footnotes.keys()}) should be in frames ({frames.keys()})"
+    check_footnotes(frames, footnotes)
 
     for i, frame in enumerate(frames):
         if i == 0:
@@ -238,6 +322,161 @@ def export_workbook(
     wb.save(path)
 
 
+def check_footnotes(frames: dict, footnotes: dict[list[list]]):
+    """Confirm that every set of footnotes corresponds to a data frame
+
+    Args:
+        frames (dict): A dictionary of pandas DataFrames.
+        footnotes (dict[list[list]]): A dictionary of footnotes.
+    """
+    # If there are footnotes, then the keys should be a subset of frames.keys()
+    if footnotes:
+        frame_set = set(frames.keys())
+        note_set = set(footnotes.keys())
+        assert frame_set.issuperset(
+            note_set
+        ), f"All keys in footnotes ({footnotes.keys()}) should be in frames ({frames.keys()})"
+
+
+def is_number(value) -> bool:
+    """Check whether a cell value would be formatted as a number"""
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def write_worksheet_streaming(
+    ws: WriteOnlyWorksheet,
+    df: pd.DataFrame,
+    name: str,
+    notes: list[list] = [],
+    skip_cols: int = 2,
+    number_format: str = numbers.FORMAT_CURRENCY_USD,
+    index: bool = False,
+):
+    """Write a data frame to a write-only worksheet.
+
+    Produces the same layout as export_workbook: a header row aligned to the top
+    with wrapped text, data in a named table, footnotes after the table and
+    right-aligned number formatted values after the first `skip_cols` columns.
+    Rows are converted CHUNK_ROWS at a time, so the data frame is never copied whole.
+
+    Args:
+        ws (WriteOnlyWorksheet): Worksheet to write to.
+        df (pd.DataFrame): Data frame to write.
+        name (str): Name of the table.
+        notes (list[list], optional): Footnote rows to add after the table. Defaults to [].
+        skip_cols (int, optional): Number of leading columns to leave unformatted.
+        Defaults to 2.
+        number_format (str, optional): Number format for numeric values. Defaults to
+        numbers.FORMAT_CURRENCY_USD.
+        index (bool, optional): Whether to write the index as the leading columns, as
+        reset_index would. Defaults to False.
+    """
+    # Empty frame with the columns that are written
+    columns = df.iloc[:0].reset_index() if index else df.iloc[:0]
+    width = max([columns.shape[1]] + [len(row) for row in notes])
+    for column in range(width):
+        ws.column_dimensions[get_column_letter(column + 1)].width = COLUMN_WIDTH
+
+    # Build each style once and share it between cells. Write-only cells are
+    # serialized as soon as their row is appended, so the styles are never mutated.
+    def style(**kwargs):
+        cell = WriteOnlyCell(ws)
+        for attribute, value in kwargs.items():
+            setattr(cell, attribute, value)
+        return cell._style
+
+    header_style = style(alignment=Alignment(vertical="top", wrap_text=True))
+    right_style = style(alignment=Alignment(horizontal="right"))
+    number_style = style(
+        alignment=Alignment(horizontal="right"), number_format=number_format
+    )
+
+    def format_row(row: list, numeric: list[bool]) -> list:
+        """Style every value after the first `skip_cols` columns"""
+        cells = list(row[:skip_cols])
+        for value, is_numeric in zip(row[skip_cols:], numeric[skip_cols:]):
+            cell = WriteOnlyCell(ws, value)
+            cell._style = (
+                number_style if is_numeric or is_number(value) else right_style
+            )
+            cells.append(cell)
+
+        return cells
+
+    header = next(dataframe_to_rows(columns, index=False))
+    header_cells = []
+    for value in header:
+        cell = WriteOnlyCell(ws, value)
+        cell._style = header_style
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    # Columns with a numeric dtype are always number formatted; values in other
+    # columns are checked one by one
+    numeric = [is_numeric_dtype(dtype) for dtype in columns.dtypes]
+    for start in range(0, df.shape[0], CHUNK_ROWS):
+        chunk = df.iloc[start : start + CHUNK_ROWS]
+        if index:
+            chunk = chunk.reset_index()
+        for row in dataframe_to_rows(chunk, index=False, header=False):
+            ws.append(format_row(row, numeric))
+
+    ref = f"A1:{get_column_letter(columns.shape[1])}{df.shape[0] + 1}"
+    add_table(ws, name, ref, header)
+
+    for row in notes:
+        row = row + [""] * (width - len(row))
+        ws.append(format_row(row, [False] * width))
+
+
+def export_workbook_streaming(
+    frames: dict,
+    path: str,
+    drop: list[str] = [],
+    format_options: dict = {},
+    footnotes: dict[list[list]] = {},
+):
+    """Export a dictionary of data frames as an Excel Workbook in write-only mode.
+
+    Rows are written to disk as they are generated rather than held in memory, so
+    memory use stays flat and time is linear in the number of cells. The layout
+    matches export_workbook.
+
+    Args:
+        frames (dict): A dictionary of pandas DataFrames.
+        path (str): The path at which to output the Excel workbook.
+        drop (list[str], optional): List of columns to drop from the data frames. Defaults to [].
+        format_options (dict, optional): Options passed to write_worksheet_streaming.
+        Defaults to {}.
+        footnotes (dict[list[list]], optional): Footnotes to add after each table.
+        Defaults to {}.
+    """
+    check_footnotes(frames, footnotes)
+
+    wb = openpyxl.Workbook(write_only=True)
+    for frame in frames:
+        ws = wb.create_sheet(frame)
+
+        df = frames[frame]
+        if drop:
+            df = df.drop(drop, axis=1)
+
+        write_worksheet_streaming(
+            ws,
+            df,
+            frame,
+            footnotes.get(frame, []),
+            index=True,
+            **format_options,
+        )
+
+    wb.save(path)
+
+
 def long_notes(new_key: str, footnotes: dict[list[list]]):
     footnotes = footnotes.copy()
     footnotes[new_key] = [note for notes in footnotes.values() for note in notes]
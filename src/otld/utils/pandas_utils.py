@@ -2,33 +2,92 @@
 
 __all__ = ["convert_to_numeric", "get_header", "excel_to_dict"]
 
+import os
 import re
+from functools import partial
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype
 
-from otld.utils.string_utils import make_negative_string
+from otld.utils.cache_utils import WorkbookCache
 
+# Translation table for negative strings: "(1,000)" and "<1,000>" become "-1000"
+NEGATIVE_STRING_TABLE = str.maketrans(
+    {"<": "-", "(": "-", ">": None, ")": None, ",": None}
+)
 
-def convert_to_numeric(series: pd.Series, numeric_type: type = float) -> pd.Series:
-    """Convert the elements in a series to integers
+
+def numeric_values(values: np.ndarray, numeric_type: type = float) -> np.ndarray:
+    """Clean, convert and round an array of values
 
     Args:
-        series (pd.Series): Pandas series to conver to integer type.
+        values (np.ndarray): One-dimensional array of values.
+        numeric_type (type, optional): Type to convert values to before rounding.
+        Defaults to float.
 
     Returns:
-        pd.Series: Series converted to type int.
+        np.ndarray: Rounded values as floats.
     """
-    try:
-        series = series.map(
-            lambda x: (make_negative_string(x) if type(x) is str else x)
-        )
-        series = series.astype(numeric_type)
-        series = series.map(lambda x: round(x) if not np.isnan(x) else x)
-    except:
-        raise
+    series = pd.Series(values, copy=False)
+    if infer_dtype(series, skipna=True) in ["string", "mixed", "mixed-integer"]:
+        # String methods return NaN for non-string values, which are left as is
+        text = series.str.translate(NEGATIVE_STRING_TABLE)
+        text = text.mask(text.str.strip() == "-", "0")
+        series = text.where(text.notna(), series)
+
+    values = series.astype(numeric_type).to_numpy(dtype=np.float64)
+
+    return np.round(values)
+
+
+def round_to_integer(values: np.ndarray, **kwargs) -> pd.Series:
+    """Create a series of rounded values with the dtype Python's round would give
+
+    Python's round returns integers, so the series is of type int unless values are
+    missing.
+    """
+    if values.size and not np.isnan(values).any():
+        values = values.astype(np.int64)
+
+    return pd.Series(values, **kwargs)
+
+
+def convert_to_numeric(
+    data: pd.Series | pd.DataFrame, numeric_type: type = float
+) -> pd.Series | pd.DataFrame:
+    """Convert the elements in a series, or every column of a data frame, to integers
+
+    Strings are cleaned before conversion: parentheses and angle brackets denote
+    negative numbers, thousands separators are removed and a lone "-" is treated as
+    zero. Values are then rounded to the nearest integer (half to even). Data frames
+    are converted in a single pass over all of their values, which is much faster
+    than applying this function column by column.
+
+    Args:
+        data (pd.Series | pd.DataFrame): Pandas series or data frame to convert to
+        integer type.
+
+    Returns:
+        pd.Series | pd.DataFrame: Data converted to type int. Columns with missing
+        values are of type float instead.
+    """
+    if isinstance(data, pd.Series):
+        values = numeric_values(data.to_numpy(), numeric_type)
+        return round_to_integer(values, index=data.index, name=data.name)
+
+    values = data.to_numpy(dtype=object).ravel(order="F")
+    values = numeric_values(values, numeric_type).reshape(data.shape, order="F")
+    df = pd.DataFrame(
+        {
+            i: round_to_integer(values[:, i], index=data.index)
+            for i in range(data.shape[1])
+        },
+        index=data.index,
+    )
+    df.columns = data.columns
 
-    return series
+    return df
 
 
 # How does get_header work if there are merged cells?
@@ -131,33 +190,43 @@ def get_header(
         return unknown_header(df, concatenate)
 
 
-def excel_to_dict(path: str, custom_args: dict = None, **kwargs) -> dict[pd.DataFrame]:
+def excel_to_dict(
+    path: str,
+    custom_args: dict = None,
+    cache: WorkbookCache | None = None,
+    **kwargs,
+) -> dict[pd.DataFrame]:
     """Convert an Excel workbook to a dictionary of data frames
 
     Args:
         path (str): Path to an Excel workbook
         custom_args (dict, optional):Any arguments to be passed to read_excel. Defaults to None.
+        cache (WorkbookCache | None, optional): Cache of the run from which to read
+        the worksheets, so that a workbook is parsed once per run. Defaults to None
+        (read the workbook directly).
 
     Returns:
         dict[pd.DataFrame]: Dictionary of data frames.
     """
-    file = pd.ExcelFile(path)
+    if cache is None:
+        file = pd.ExcelFile(path)
+        read_sheet = partial(pd.read_excel, file)
+    else:
+        file = cache.excel_file(path)
+        read_sheet = partial(cache.read_excel, path)
+
     sheets = file.sheet_names
     if custom_args:
-        try:
-            dictionary = {
-                sheet: pd.read_excel(file, sheet_name=sheet, **custom_args[sheet])
-                for sheet in sheets
-            }
-        except:
-            raise
-
-    else:
         dictionary = {
-            sheet: pd.read_excel(file, sheet_name=sheet, **kwargs) for sheet in sheets
+            sheet: read_sheet(sheet_name=sheet, **custom_args[sheet])
+            for sheet in sheets
         }
+    else:
+        dictionary = {sheet: read_sheet(sheet_name=sheet, **kwargs) for sheet in sheets}
 
-    file.close()
+    # Cached workbooks stay open for later readers
+    if cache is None:
+        file.close()
 
     return dictionary
 
@@ -177,3 +246,33 @@ def dict_to_excel(dictionary: dict, path: str, **kwargs) -> None:
         )
 
     writer.close()
+
+
+def dict_to_parquet(frames: dict[pd.DataFrame], path: str) -> None:
+    """Write a dictionary of data frames to a directory of Parquet files
+
+    Each data frame is written to `<path>/<key>.parquet`, preserving its index.
+
+    Args:
+        frames (dict[pd.DataFrame]): A dictionary of data frames.
+        path (str): The directory in which to write the Parquet files.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name, df in frames.items():
+        df.to_parquet(os.path.join(path, f"{name}.parquet"))
+
+
+def parquet_to_dict(path: str) -> dict[pd.DataFrame]:
+    """Read a directory of Parquet files written by dict_to_parquet
+
+    Args:
+        path (str): The directory containing the Parquet files.
+
+    Returns:
+        dict[pd.DataFrame]: Dictionary of data frames keyed by file stem.
+    """
+    files = sorted(file for file in os.listdir(path) if file.endswith(".parquet"))
+    return {
+        os.path.splitext(file)[0]: pd.read_parquet(os.path.join(path, file))
+        for file in files
+    }
@@ -0,0 +1,150 @@
+"""Utilities for reshaping wide TANF data to long"""
+
+__all__ = ["wide_to_long"]
+
+import numpy as np
+import pandas as pd
+
+
+def value_dtype(frames: list[pd.DataFrame], value_vars: list[str] | None) -> np.dtype:
+    """Common dtype of the values of several data frames, as pd.concat would give
+
+    Empty data frames are skipped unless every data frame is empty. Extension dtypes
+    are treated as objects.
+    """
+    non_empty = [df for df in frames if not df.empty] or frames
+    dtypes = [
+        dtype if isinstance(dtype, np.dtype) else np.dtype(object)
+        for df in non_empty
+        for dtype in (df.dtypes if value_vars is None else df.dtypes[value_vars])
+    ]
+
+    return np.result_type(*dtypes) if dtypes else np.dtype(object)
+
+
+def code_dtype(categories: int) -> np.dtype:
+    """Smallest signed integer type that holds the codes of a number of categories"""
+    return np.min_scalar_type(-categories - 1)
+
+
+def index_codes(index: pd.Index) -> tuple[list[pd.Index], list[np.ndarray]]:
+    """Levels and codes of each level of an index
+
+    Missing values have code -1, as in a MultiIndex.
+    """
+    if isinstance(index, pd.MultiIndex):
+        return list(index.levels), list(index.codes)
+
+    codes, uniques = pd.factorize(index)
+    return [uniques], [codes]
+
+
+def union_level(levels: list[pd.Index]) -> pd.Index:
+    """Unique values of several index levels, in order of appearance
+
+    Empty levels are skipped, so that they do not change the dtype of the union.
+    """
+    levels = [level for level in levels if len(level)] or levels
+
+    return levels[0].append(levels[1:]).unique()
+
+
+def wide_to_long(
+    frames: dict[pd.DataFrame],
+    value_name: str,
+    value_vars: list[str] = None,
+    var_name: str = "Category",
+    key_name: str = "Funding",
+    consume: bool = False,
+) -> pd.DataFrame:
+    """Stack wide data frames into a single long data frame
+
+    Gives the same rows as melting each data frame with ignore_index=False, adding
+    its key as a column and concatenating the results, without building the melted
+    copies. Values are copied column by column into one preallocated array, and the
+    category, key and index levels are built from integer codes, so the categories
+    and keys are categoricals.
+
+    Args:
+        frames (dict[pd.DataFrame]): Wide data frames keyed by funding level. Every
+        data frame must have the same index levels.
+        value_name (str): Name of the column of values.
+        value_vars (list[str], optional): Columns to stack, in order. Defaults to
+        None (every column).
+        var_name (str, optional): Name of the column of column names. Defaults to
+        "Category".
+        key_name (str, optional): Name of the column of keys. Defaults to "Funding".
+        consume (bool, optional): Whether to remove each data frame from `frames`
+        once it is stacked, so that memory use peaks near the size of the long data
+        frame rather than the wide and long data frames together. Defaults to False.
+
+    Returns:
+        pd.DataFrame: Long data frame with the stacked index of the wide data frames
+        and the columns var_name, value_name and key_name.
+    """
+    keys = list(frames)
+    columns = [
+        list(frames[key].columns if value_vars is None else value_vars) for key in keys
+    ]
+    shapes = [(frames[key].shape[0], len(cols)) for key, cols in zip(keys, columns)]
+    sizes = [rows * cols for rows, cols in shapes]
+    size = sum(sizes)
+
+    variables = pd.Index(list(dict.fromkeys(col for cols in columns for col in cols)))
+
+    # Each index level of the long data frame holds the values of every data frame
+    encoded = [index_codes(frames[key].index) for key in keys]
+    first = frames[keys[0]].index if keys else pd.RangeIndex(0)
+    levels = [
+        union_level(frame_levels)
+        for frame_levels in zip(*(frame_levels for frame_levels, _ in encoded))
+    ] or [first]
+
+    values = np.empty(size, value_dtype(list(frames.values()), value_vars))
+    variable_codes = np.empty(size, code_dtype(len(variables)))
+    key_codes = np.repeat(np.arange(len(keys), dtype=code_dtype(len(keys))), sizes)
+    level_codes = [np.empty(size, code_dtype(len(level))) for level in levels]
+
+    start = 0
+    for key, cols, (rows, width), block_size, (frame_levels, frame_codes) in zip(
+        keys, columns, shapes, sizes, encoded
+    ):
+        df = frames.pop(key) if consume else frames[key]
+        stop = start + block_size
+
+        # Melted values run column by column, so each column is a row of the block
+        block = values[start:stop].reshape(width, rows)
+        for i, col in enumerate(cols):
+            block[i] = df[col].to_numpy()
+
+        variable_codes[start:stop] = np.repeat(variables.get_indexer(cols), rows)
+
+        # The index of the data frame is repeated for every column
+        for level, codes, frame_level, frame_level_codes in zip(
+            levels, level_codes, frame_levels, frame_codes
+        ):
+            # Missing values have code -1, which picks the appended -1
+            mapping = np.append(level.get_indexer(frame_level), -1)
+            codes[start:stop] = np.tile(mapping[frame_level_codes], width)
+
+        start = stop
+        del df
+
+    if len(levels) > 1:
+        index = pd.MultiIndex(
+            levels=levels, codes=level_codes, names=first.names, verify_integrity=False
+        )
+    else:
+        codes = level_codes[0]
+        index = levels[0].take(codes, allow_fill=(codes < 0).any(), fill_value=np.nan)
+        index.name = first.name
+
+    return pd.DataFrame(
+        {
+            var_name: pd.Categorical.from_codes(variable_codes, categories=variables),
+            value_name: values,
+            key_name: pd.Categorical.from_codes(key_codes, categories=keys),
+        },
+        index=index,
+        copy=False,
+    )
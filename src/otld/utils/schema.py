@@ -0,0 +1,150 @@
+"""Canonical schema for long TANF data
+
+Columns drawn from a fixed vocabulary (states, funding levels, categories and their
+descriptions) are stored as categoricals and fiscal years as the most compact integer
+type that holds them. Amounts and numbers keep their 64-bit types, as arithmetic on
+narrower integers overflows. Values outside of a vocabulary are kept by appending them
+to its categories.
+"""
+
+__all__ = [
+    "LONG_SCHEMA",
+    "to_categorical",
+    "map_categories",
+    "downcast_integer",
+    "apply_long_schema",
+]
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype, is_integer_dtype
+
+from otld.utils.caseload_utils import CATEGORIES
+from otld.utils.consolidation import CONSOLIDATION_MAP
+from otld.utils.crosswalk_dict import crosswalk_dict
+from otld.utils.states import STATES
+
+FUNDING = ["Total", "Federal", "State", "TANF", "TANF_SSP", "SSP_MOE"]
+FINANCIAL_CATEGORIES = [
+    f"{key}. {value["name"]}" for key, value in crosswalk_dict.items() if value["name"]
+]
+CONSOLIDATED_CATEGORIES = list(dict.fromkeys(CONSOLIDATION_MAP.values()))
+DESCRIPTIONS = list(
+    dict.fromkeys(
+        value["description"]
+        for value in crosswalk_dict.values()
+        if value.get("description")
+    )
+)
+
+# Vocabulary of each categorical column in long data
+LONG_SCHEMA = {
+    "State": STATES,
+    "Funding": FUNDING,
+    "Category": [*FINANCIAL_CATEGORIES, *CONSOLIDATED_CATEGORIES, *CATEGORIES],
+    "description": DESCRIPTIONS,
+    "consolidated_column": ["", *CONSOLIDATED_CATEGORIES],
+}
+
+# Columns stored as compact integers
+INTEGER_COLUMNS = ["FiscalYear"]
+
+
+def to_categorical(series: pd.Series, vocabulary: list[str]) -> pd.Series:
+    """Convert a series to a categorical backed by a fixed vocabulary
+
+    Args:
+        series (pd.Series): Series to convert.
+        vocabulary (list[str]): Expected values, in order. Any other values in the
+        series are appended to the categories in sorted order.
+
+    Returns:
+        pd.Series: Categorical series.
+    """
+    values = series.dropna().unique()
+    known = set(vocabulary)
+    extra = sorted((value for value in values if value not in known), key=str)
+    dtype = pd.CategoricalDtype([*vocabulary, *extra])
+
+    # Unordered categoricals compare equal, and astype is a no-op, regardless of the
+    # order of the categories, so categoricals are recoded explicitly
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if series.dtype.categories.equals(dtype.categories):
+            return series
+        return series.cat.set_categories(dtype.categories)
+
+    return series.astype(dtype)
+
+
+def map_categories(series: pd.Series, mapper: dict | Callable) -> pd.Series:
+    """Map a categorical series through a lookup, once per category
+
+    Unlike Series.map, the result stays categorical when several categories map to
+    the same value.
+
+    Args:
+        series (pd.Series): Series to map. Converted to a categorical if it is not
+        one.
+        mapper (dict | Callable): Lookup or function applied to each category.
+        Categories missing from a lookup map to missing values.
+
+    Returns:
+        pd.Series: Categorical series of mapped values.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+
+    codes, values = pd.factorize(series.cat.categories.map(mapper))
+
+    # Missing values have code -1, which picks the appended -1
+    codes = np.append(codes, -1)[series.cat.codes]
+    values = pd.Categorical.from_codes(codes, categories=values)
+
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def downcast_integer(series: pd.Series) -> pd.Series:
+    """Store a numeric series as the smallest integer type that holds its values
+
+    Series containing missing or fractional values are returned unchanged.
+
+    Args:
+        series (pd.Series): Series to downcast.
+
+    Returns:
+        pd.Series: Downcast series.
+    """
+    if is_float_dtype(series.dtype):
+        values = series.to_numpy()
+        if not np.isfinite(values).all() or not (values == np.round(values)).all():
+            return series
+        series = series.astype(np.int64)
+    elif not is_integer_dtype(series.dtype):
+        return series
+
+    return pd.to_numeric(series, downcast="integer")
+
+
+def apply_long_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the canonical schema to the columns of long data
+
+    Columns not in the schema, including Amount and Number, are left as is.
+
+    Args:
+        df (pd.DataFrame): Long data frame.
+
+    Returns:
+        pd.DataFrame: Data frame with categorical and compact integer columns.
+    """
+    df = df.copy(deep=False)
+    for column, vocabulary in LONG_SCHEMA.items():
+        if column in df.columns:
+            df[column] = to_categorical(df[column], vocabulary)
+
+    for column in INTEGER_COLUMNS:
+        if column in df.columns:
+            df[column] = downcast_integer(df[column])
+
+    return df
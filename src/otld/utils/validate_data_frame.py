@@ -1,49 +1,147 @@
 """Validate TANF data"""
 
-import pandas as pd
-from pandas.api.types import is_numeric_dtype
+from typing import TYPE_CHECKING
 
-from otld.utils import STATES
+from otld.utils.states import STATES
 
+# Imported when called, as otld.utils imports this function when it is loaded
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
-def validate_data_frame(df: pd.DataFrame):
-    """Validate TANF data"""
-    # Confirm all columns are numeric
-    is_numeric = df.dtypes.map(is_numeric_dtype)
-    not_numeric = df.columns[~is_numeric]
-    assert is_numeric.all(), f"Some columns not numeric: {not_numeric}"
+# Valid state names, for constant time membership tests
+VALID_STATES = frozenset(STATES)
+
+
+class ValidationResult:
+    """Violations found when validating a data frame
+
+    Violations are recorded by check, so that every failing check is reported at
+    once rather than only the first.
+    """
+
+    # Message of each check, formatted with the violating values
+    MESSAGES = {
+        "numeric": "Some columns not numeric: {}",
+        "duplicated_columns": "Some columns duplicated: {}",
+        "duplicated_index": "Some indices duplicated: {}",
+        "states": "Some states are invalid: {}",
+        "columns": "Incorrect columns {}",
+    }
+
+    def __init__(self):
+        """Initialize ValidationResult"""
+        self._violations = {}
+
+    @property
+    def violations(self) -> dict[str, list]:
+        """Violating values by check"""
+        return self._violations
+
+    @property
+    def valid(self) -> bool:
+        """Whether every check passed"""
+        return not self._violations
+
+    def add(self, check: str, values: list) -> None:
+        """Record the violations of a check
+
+        Args:
+            check (str): Name of the check.
+            values (list): Violating values. Nothing is recorded if empty.
+        """
+        if len(values) > 0:
+            self._violations[check] = values
+
+    def raise_for_violations(self) -> None:
+        """Raise an AssertionError listing every violation
+
+        Raises:
+            AssertionError: If any check failed.
+        """
+        if not self.valid:
+            raise AssertionError(str(self))
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.MESSAGES.get(check, f"{check}: {{}}").format(values)
+            for check, values in self._violations.items()
+        )
 
-    # Confirm no columns duplicated
-    duplicated = df.columns[df.columns.duplicated()]
-    assert not df.columns.duplicated().any(), f"Some columns duplicated: {duplicated}"
 
-    # Confirm no indices duplicated
-    duplicated = df.index[df.index.duplicated()]
-    assert not df.index.duplicated().any(), f"Some indices duplicated: {duplicated}"
+def invalid_state_mask(values: "pd.Index | pd.Series") -> "np.ndarray | pd.Series":
+    """Flag state names that are not valid
 
-    # Confirm all states are valid
+    Args:
+        values (pd.Index | pd.Series): State names.
+
+    Returns:
+        np.ndarray | pd.Series: True where the state name is not valid.
+    """
+    return ~values.isin(VALID_STATES)
+
+
+def validate_data_frame(
+    df: "pd.DataFrame", raise_errors: bool = True
+) -> ValidationResult:
+    """Validate TANF data
+
+    Columns must be numeric and unique, the index must be unique and states, in the
+    State index level or column, must be valid. The data frame is not copied or
+    modified.
+
+    Args:
+        df (pd.DataFrame): Data frame to validate.
+        raise_errors (bool, optional): Whether to raise an AssertionError listing
+        every violation. Defaults to True.
+
+    Returns:
+        ValidationResult: Violations found.
+    """
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import is_numeric_dtype
+
+    result = ValidationResult()
+
+    # Confirm all columns are numeric
+    is_numeric = np.array([is_numeric_dtype(dtype) for dtype in df.dtypes], bool)
+    result.add("numeric", df.columns[~is_numeric].to_list())
+
+    # Confirm no columns or indices duplicated
+    result.add(
+        "duplicated_columns", df.columns[df.columns.duplicated()].unique().to_list()
+    )
+    result.add("duplicated_index", df.index[df.index.duplicated()].to_list())
+
+    # Confirm all states are valid, checking each distinct state of an index level once
     if "State" in df.index.names:
         if isinstance(df.index, pd.MultiIndex):
-            index = [i for i, name in enumerate(df.index.names) if name == "State"]
-            index = index[0]
-            invalid_states = [
-                i for i, tup in enumerate(df.index) if tup[index] not in STATES
-            ]
+            level = df.index.names.index("State")
+            # Missing states have code -1, which picks the appended True
+            invalid = np.append(invalid_state_mask(df.index.levels[level]), True)
+            invalid = invalid[df.index.codes[level]]
         else:
-            invalid_states = [i for i, state in df.index if state not in STATES]
-        invalid_states = df.index[invalid_states].to_list()
+            invalid = invalid_state_mask(df.index)
+        result.add("states", df.index[invalid].to_list())
     elif "State" in df.columns:
-        invalid_states = [state for state in df["State"] if state not in STATES]
+        states = df["State"]
+        result.add("states", states[invalid_state_mask(states)].to_list())
+
+    if raise_errors:
+        result.raise_for_violations()
 
-    try:
-        assert not any(invalid_states), f"Some states are invalid: {invalid_states}"
-    except (UnboundLocalError, NameError):
-        pass
+    return result
 
 
 if __name__ == "__main__":
     import os
 
+    import pandas as pd
+
     from otld.paths import inter_dir
 
     federal = pd.read_csv(
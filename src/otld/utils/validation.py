@@ -146,7 +146,7 @@ def main():
             continue
 
         # Process raw data using existing function
-        raw_df = process_workbook(filepath, data_type)
+        raw_df = process_workbook(filepath, data_type, 2023)
         if raw_df is None:
             continue
 
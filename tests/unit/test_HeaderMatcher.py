@@ -0,0 +1,54 @@
+import unittest
+
+from otld.utils.HeaderMatcher import HeaderMatcher, normalize
+
+NAMES = [
+    "Basic Assistance",
+    "Basic assistance",
+    "Work, Education, and Training Activities",
+    "Non-Recurrent Short Term Benefits",
+    "Expenditures on Non-Assistance: Other Services Provided to Low-Income "
+    "Families, Including Pre-Kindergarten and Head Start Programs, Services for "
+    "Children and Youth, and Prevention of Out-of-Wedlock Pregnancies",
+]
+
+
+class TestHeaderMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = HeaderMatcher(NAMES)
+
+    def test_normalize(self):
+        self.assertEqual(
+            normalize("  Non-Recurrent, Short Term "), "non recurrent  short term"
+        )
+
+    def test_match(self):
+        # Exact matches are preferred over normalized matches
+        self.assertEqual(self.matcher.match("Basic assistance"), "Basic assistance")
+
+        # Normalized matches are broken by the order of the names
+        self.assertEqual(self.matcher.match("BASIC ASSISTANCE:"), "Basic Assistance")
+        self.assertEqual(
+            self.matcher.match("Non Recurrent Short-Term Benefits"),
+            "Non-Recurrent Short Term Benefits",
+        )
+
+        # Long headers that differ by a character have a similarity that rounds to
+        # 100%, short ones do not
+        self.assertEqual(
+            self.matcher.match(NAMES[-1].replace("Head", "Heed")), NAMES[-1]
+        )
+        self.assertIsNone(self.matcher.match("Basic Assistence"))
+        self.assertIsNone(self.matcher.match(""))
+
+        # Matches are memoized
+        self.assertIn("BASIC ASSISTANCE:", self.matcher._cache)
+
+    def test_for_names(self):
+        matcher = HeaderMatcher.for_names(NAMES)
+        self.assertIs(matcher, HeaderMatcher.for_names(list(NAMES)))
+        self.assertIsNot(matcher, HeaderMatcher.for_names(NAMES[:2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
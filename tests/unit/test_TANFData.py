@@ -1,14 +1,19 @@
 import os
+import shutil
 import tempfile
 import time
 import unittest
+from unittest.mock import patch
 
 from pandas import ExcelFile
+from pandas.testing import assert_frame_equal
 
 from data import CASELOAD_DATA_WIDE, FINANCIAL_DATA_WIDE, GET_HEADER_DICT
 from otld.append.TANFData import TANFData
+from otld.utils.long_store import read_long_store
 from otld.utils.MockData import MockData
-from otld.utils.pandas_utils import dict_to_excel
+from otld.utils.pandas_utils import dict_to_excel, parquet_to_dict
+from otld.utils.RunProfiler import RunProfiler
 
 TEMP_DIR = tempfile.TemporaryDirectory()
 MOCK_DIR = TEMP_DIR.name
@@ -94,11 +99,151 @@ class TestTANFData(unittest.TestCase):
         self.assertTrue(os.path.exists(wide_path))
         self.assertTrue(os.path.exists(long_path))
 
+        # Long data is also written to a partitioned Parquet store
+        store_path = TANFData.sidecar_path(long_path)
+        df = read_long_store(store_path, funding=["Federal"], years=(2024, 2024))
+        self.assertEqual(set(df["Funding"]), {"Federal"})
+        self.assertEqual(set(df["FiscalYear"]), {2024})
+
         os.remove(wide_path)
         os.remove(long_path)
+        shutil.rmtree(store_path)
+
+        tanf_data.close_excel_files()
+
+    def test_append_profile(self):
+        financial_data_wide_path = os.path.join(self.mock_dir, "FinancialDataWide.xlsx")
+        dict_to_excel(FINANCIAL_DATA_WIDE, financial_data_wide_path)
+
+        profiler = RunProfiler("tanf-append")
+        tanf_data = TANFData(
+            "financial",
+            financial_data_wide_path,
+            FINANCIAL_MOCKED[0],
+            profiler=profiler,
+        )
+        tanf_data.append()
+        tanf_data.close_excel_files()
+
+        # Each stage is recorded for every funding level
+        stages = [(stage["stage"], stage["level"]) for stage in profiler.stages]
+        for level in ["Total", "Federal", "State"]:
+            for name in ["parse", "rename", "validate", "base", "concat"]:
+                self.assertIn((name, level), stages)
+        for name in ["export wide", "melt", "export long"]:
+            self.assertIn((name, None), stages)
+
+        parse = profiler.stages[0]
+        self.assertEqual(parse["workbook"], os.path.basename(FINANCIAL_MOCKED[0]))
+        self.assertGreater(parse["cells"], 0)
+        self.assertGreater(parse["peak_rss_mb"], 0)
+
+        profiler.export(self.mock_dir, "FinancialAppendProfile")
+        for extension in ["json", "xlsx"]:
+            path = os.path.join(self.mock_dir, f"FinancialAppendProfile.{extension}")
+            self.assertTrue(os.path.exists(path))
+            os.remove(path)
+
+        current_date = time.strftime("%Y%m%d", time.gmtime())
+        for shape in ["Wide", "Long"]:
+            os.remove(
+                os.path.join(self.mock_dir, f"FinancialData{shape}_{current_date}.xlsx")
+            )
+
+    def test_append_incremental(self):
+        financial_data_wide_path = os.path.join(self.mock_dir, "FinancialDataWide.xlsx")
+        dict_to_excel(FINANCIAL_DATA_WIDE, financial_data_wide_path)
+
+        # Without a sidecar, the base is read from Excel and a sidecar is written
+        tanf_data = TANFData(
+            "financial", financial_data_wide_path, FINANCIAL_MOCKED[0], incremental=True
+        )
+        self.assertIsNone(tanf_data.load_sidecar())
+        tanf_data.append()
+        tanf_data.close_excel_files()
+
+        current_date = time.strftime("%Y%m%d", time.gmtime())
+        wide_path = os.path.join(
+            self.mock_dir, f"FinancialDataWide_{current_date}.xlsx"
+        )
+        long_path = os.path.join(
+            self.mock_dir, f"FinancialDataLong_{current_date}.xlsx"
+        )
+        sidecar_path = TANFData.sidecar_path(wide_path)
+        self.assertTrue(os.path.isdir(sidecar_path))
+        frames = parquet_to_dict(sidecar_path)
+        self.assertEqual(sorted(frames.keys()), ["Federal", "State", "Total"])
+
+        # Re-appending the same year from the sidecar replaces its rows
+        tanf_data = TANFData(
+            "financial", wide_path, FINANCIAL_MOCKED[0], incremental=True
+        )
+        self.assertIsNotNone(tanf_data.load_sidecar())
+        tanf_data.append()
+
+        # The appended workbook is never opened
+        self.assertIsNone(tanf_data._appended)
+        tanf_data.close_excel_files()
 
+        rerun = parquet_to_dict(sidecar_path)
+        for level, df in frames.items():
+            self.assertEqual(df.shape, rerun[level].shape)
+            self.assertFalse(rerun[level].index.duplicated().any())
+
+        # Once the workbook changes, the sidecar is stale and the workbook is read
+        stat = os.stat(wide_path)
+        os.utime(wide_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        tanf_data = TANFData(
+            "financial", wide_path, FINANCIAL_MOCKED[0], incremental=True
+        )
+        self.assertIsNone(tanf_data.load_sidecar())
         tanf_data.close_excel_files()
 
+        os.remove(wide_path)
+        os.remove(long_path)
+        shutil.rmtree(sidecar_path)
+
+    def test_append_concurrent(self):
+        caseload_data_wide_path = os.path.join(self.mock_dir, "CaseloadDataWide.xlsx")
+        dict_to_excel(CASELOAD_DATA_WIDE, caseload_data_wide_path)
+
+        current_date = time.strftime("%Y%m%d", time.gmtime())
+        frames = {}
+        for workers, executor in [(1, "process"), (2, "process"), (None, "thread")]:
+            profiler = RunProfiler("tanf-append")
+            tanf_data = TANFData(
+                "caseload",
+                caseload_data_wide_path,
+                CASELOAD_MOCKED,
+                profiler=profiler,
+                workers=workers,
+                executor=executor,
+            )
+            tanf_data.append()
+            tanf_data.close_excel_files()
+            frames[(workers, executor)] = tanf_data._frames
+
+            # Every worksheet is parsed in one stage and collected in order
+            stages = [stage["stage"] for stage in profiler.stages]
+            self.assertEqual(stages.count("parse sheets"), int(workers != 1))
+            self.assertEqual(stages.count("parse"), 6)
+
+            for shape in ["Wide", "Long"]:
+                os.remove(
+                    os.path.join(
+                        self.mock_dir, f"CaseloadData{shape}_{current_date}.xlsx"
+                    )
+                )
+
+        serial = frames.pop((1, "process"))
+        for concurrent in frames.values():
+            self.assertEqual(list(concurrent), list(serial))
+            for level, df in serial.items():
+                assert_frame_equal(concurrent[level], df)
+
+        with self.assertRaises(ValueError):
+            TANFData("caseload", caseload_data_wide_path, CASELOAD_MOCKED, executor="x")
+
     def test_get_header_wrapper(self):
         financial_data_wide_path = os.path.join(self.mock_dir, "FinancialDataWide.xlsx")
         dict_to_excel(FINANCIAL_DATA_WIDE, financial_data_wide_path)
@@ -220,6 +365,33 @@ class TestTANFData(unittest.TestCase):
 
         tanf_data.close_excel_files()
 
+    def test_parse_cache(self):
+        financial_data_wide_path = os.path.join(self.mock_dir, "FinancialDataWide.xlsx")
+        dict_to_excel(FINANCIAL_DATA_WIDE, financial_data_wide_path)
+        cache_dir = os.path.join(self.mock_dir, "cache")
+
+        tanf_data = TANFData(
+            "financial",
+            financial_data_wide_path,
+            FINANCIAL_MOCKED[0],
+            cache_dir=cache_dir,
+        )
+        tanf_data._level = "Federal"
+        tanf_data.get_worksheets().get_df()
+        expected = tanf_data._df
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        # A second parse of the unchanged workbook should not touch Excel
+        with patch(
+            "otld.append.TANFData.pd.read_excel",
+            side_effect=AssertionError("Worksheet was re-parsed"),
+        ):
+            tanf_data.get_df()
+
+        assert_frame_equal(expected, tanf_data._df)
+
+        tanf_data.close_excel_files()
+
     def tearDown(self):
         return super().tearDown()
 
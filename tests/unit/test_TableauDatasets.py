@@ -105,6 +105,19 @@ class TestTableauDatasets(unittest.TestCase):
             os.path.exists(os.path.join(self.tableau_dir, "FinancialDataLong.xlsx"))
         )
 
+    def test_generate_parses_once(self):
+        sys.argv = ["tanf-tableau", "caseload", *CASELOAD_MOCKED, self.tableau_dir]
+        tableau_datasets = TableauDatasets()
+        tableau_datasets.generate()
+
+        # The long dataset reuses the worksheets parsed for the wide dataset
+        sheets = len(pd.ExcelFile(*CASELOAD_MOCKED).sheet_names)
+        self.assertEqual(tableau_datasets.workbooks.misses, sheets)
+        self.assertEqual(tableau_datasets.workbooks.hits, sheets)
+
+        # The cache is cleared when the run ends
+        self.assertEqual(tableau_datasets.workbooks.nbytes, 0)
+
     def tearDown(self):
         return super().tearDown()
 
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import openpyxl
+import xlsxwriter
+
+from otld.utils.WorkbookSession import WorkbookSession
+
+
+class TestWorkbookSession(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "tanf_2015.xlsx")
+
+        workbook = openpyxl.Workbook()
+        for i, title in enumerate(["Federal", "State"]):
+            worksheet = workbook.active if i == 0 else workbook.create_sheet()
+            worksheet.title = title
+            worksheet.append([f"{title} Expenditures"])
+            worksheet.append(["STATE", "Assistance", None, None, None])
+            worksheet.append([None, "Cash", "Other", None, "Total"])
+            worksheet.append(["Alabama", 1, 2, None, 3 + i])
+            worksheet.merge_cells("B2:C2")
+            worksheet.merge_cells("A2:A3")
+        workbook.save(self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_table(self):
+        with patch(
+            "otld.utils.WorkbookSession.openpyxl.load_workbook",
+            wraps=openpyxl.load_workbook,
+        ) as load_workbook:
+            with WorkbookSession(self.path) as workbook:
+                self.assertEqual(workbook.name, "tanf_2015.xlsx")
+                self.assertEqual(workbook.sheet_names, ["Federal", "State"])
+                frames = [workbook.read_table(sheet) for sheet in workbook.sheet_names]
+                raw = workbook.read_excel("State", header=None)
+
+        # The workbook is loaded once for every sheet
+        load_workbook.assert_called_once()
+
+        for i, df in enumerate(frames):
+            self.assertEqual(
+                df.columns.tolist(),
+                ["STATE STATE", "Assistance Cash", "Assistance Other", "Total"],
+            )
+            self.assertEqual(df.values.tolist(), [["Alabama", 1, 2, 3 + i]])
+
+        self.assertEqual(raw.iloc[0, 0], "State Expenditures")
+
+    def test_formulas(self):
+        # Formula cells are read as their cached values, not the formula text
+        path = os.path.join(self.temp_dir.name, "tanf_2016.xlsx")
+        workbook = xlsxwriter.Workbook(path)
+        worksheet = workbook.add_worksheet("Federal")
+        worksheet.write_row(0, 0, ["Federal Expenditures"])
+        worksheet.write_row(1, 0, ["STATE", "Cash", "Other", "Total"])
+        worksheet.write_row(2, 0, ["Alabama", 1, 2])
+        worksheet.write_formula(2, 3, "=SUM(B3:C3)", None, 3)
+        workbook.close()
+
+        with WorkbookSession(path) as workbook:
+            df = workbook.read_table("Federal")
+
+        self.assertEqual(df.values.tolist(), [["Alabama", 1, 2, 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
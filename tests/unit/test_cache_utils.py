@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from otld.utils.cache_utils import ParseCache, WorkbookCache, code_version
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temp_dir.name, "source.xlsx")
+        with open(self.source, "wb") as f:
+            f.write(b"original bytes")
+
+        self.cache = ParseCache(os.path.join(self.temp_dir.name, "cache"), "1")
+        self.df = pd.DataFrame({"State": ["Alabama", "Alaska"], "Amount": [1, 2]})
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.get(self.source, "financial", "Sheet"))
+
+        self.cache.set(self.source, "financial", "Sheet", df=self.df)
+        assert_frame_equal(self.df, self.cache.get(self.source, "financial", "Sheet"))
+
+        # Other sheets and other parser versions are separate entries
+        self.assertIsNone(self.cache.get(self.source, "financial", "Other"))
+        other_version = ParseCache(self.cache.directory, "2")
+        self.assertIsNone(other_version.get(self.source, "financial", "Sheet"))
+
+    def test_content_addressed(self):
+        self.cache.set(self.source, "financial", "Sheet", df=self.df)
+
+        # A copy with identical bytes hits the cache
+        copy = os.path.join(self.temp_dir.name, "copy.xlsx")
+        shutil.copy(self.source, copy)
+        assert_frame_equal(self.df, self.cache.get(copy, "financial", "Sheet"))
+
+        # Editing the file invalidates the entry
+        with open(self.source, "wb") as f:
+            f.write(b"edited bytes")
+        self.assertIsNone(self.cache.get(self.source, "financial", "Sheet"))
+
+    def test_parquet(self):
+        # Object columns of numbers keep their dtype
+        df = self.df.astype({"Amount": object}).set_index("State")
+        self.cache.set(self.source, "caseload", "Sheet", df=df)
+        self.assertTrue(os.listdir(self.cache.directory)[0].endswith(".parquet"))
+        assert_frame_equal(df, self.cache.get(self.source, "caseload", "Sheet"))
+
+        # Column labels that are not strings are restored
+        df = pd.DataFrame({"196R": ["1"], 196: ["5a"]})
+        self.cache.set(self.source, "crosswalk", df=df)
+        assert_frame_equal(df, self.cache.get(self.source, "crosswalk"))
+
+        # Frames Parquet cannot store are not cached
+        df = pd.DataFrame({"Mixed": ["a", 1]})
+        self.cache.set(self.source, "caseload", "Other", df=df)
+        self.assertIsNone(self.cache.get(self.source, "caseload", "Other"))
+        self.assertEqual(len(os.listdir(self.cache.directory)), 2)
+
+    def test_code_version(self):
+        def parse(df):
+            return df
+
+        def parse_and_fill(df):
+            return df.fillna(0)
+
+        self.assertEqual(code_version(parse), code_version(parse))
+        self.assertNotEqual(code_version(parse), code_version(parse, parse_and_fill))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+
+class TestWorkbookCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "workbook.xlsx")
+        self.df = pd.DataFrame({"State": ["Alabama", "Alaska"], "Amount": [1, 2]})
+        self.write(self.df)
+        self.cache = WorkbookCache()
+
+    def write(self, df: pd.DataFrame):
+        with pd.ExcelWriter(self.path) as writer:
+            df.to_excel(writer, sheet_name="First", index=False)
+            df.to_excel(writer, sheet_name="Second", index=False)
+
+    def test_parsed_once(self):
+        frames = self.cache.read_excel(self.path, sheet_name=None)
+        self.assertEqual(list(frames), ["First", "Second"])
+        assert_frame_equal(self.cache.read_excel(self.path, "Second"), self.df)
+        self.assertEqual((self.cache.misses, self.cache.hits), (2, 1))
+
+        # Other arguments are separate entries
+        self.cache.read_excel(self.path, "Second", header=None)
+        self.assertEqual(self.cache.misses, 3)
+
+        # Consumers receive copies
+        frames["First"].loc[0, "Amount"] = 100
+        assert_frame_equal(self.cache.read_excel(self.path), self.df)
+
+    def test_modified(self):
+        self.cache.read_excel(self.path)
+
+        # A rewritten workbook is read again
+        edited = self.df.assign(Amount=[3, 4])
+        self.write(edited)
+        os.utime(self.path, ns=(0, 0))
+        assert_frame_equal(self.cache.read_excel(self.path), edited)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_budget(self):
+        nbytes = int(self.df.memory_usage(deep=True).sum())
+        cache = WorkbookCache(max_bytes=nbytes)
+        cache.read_excel(self.path, "First")
+        cache.read_excel(self.path, "Second")
+        self.assertEqual(cache.nbytes, nbytes)
+
+        # The least recently used worksheet was evicted
+        cache.read_excel(self.path, "Second")
+        cache.read_excel(self.path, "First")
+        self.assertEqual((cache.misses, cache.hits), (3, 1))
+
+        # Worksheets larger than the budget are not stored
+        cache = WorkbookCache(max_bytes=0)
+        cache.read_excel(self.path)
+        self.assertEqual(cache.nbytes, 0)
+
+    def tearDown(self):
+        self.cache.clear()
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+
+if __name__ == "__main__":
+    unittest.main()
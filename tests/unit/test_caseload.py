@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from otld.append.caseload import process_workbooks
+from otld.utils.states import STATES
+
+
+class TestProcessWorkbooks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tasks = [
+            (self.write(year), "Federal", year) for year in [2010, 2011, 2013]
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, year: int) -> str:
+        """Write a caseload workbook in the 2000-2020 format"""
+        path = os.path.join(self.temp_dir.name, f"tanf_caseload_fy{year}.xlsx")
+        families = [
+            [state, 4 * i + year, i, 2 * i + year, i] for i, state in enumerate(STATES)
+        ]
+        recipients = [[state, 3 * i, i, 2 * i] for i, state in enumerate(STATES)]
+
+        # Data starts after five rows of titles
+        with pd.ExcelWriter(path) as writer:
+            for sheet, rows in [("Families", families), ("Recipients", recipients)]:
+                df = pd.DataFrame([[None] * len(rows[0])] * 5 + rows)
+                df.to_excel(
+                    writer, sheet_name=f"FY{year}-{sheet}", index=False, header=False
+                )
+
+        return path
+
+    def test_process_workbooks(self):
+        serial = process_workbooks(self.tasks)
+        pooled = process_workbooks(self.tasks, workers=2)
+
+        # Pooled runs return the same frames, in task order
+        self.assertEqual(len(pooled), len(self.tasks))
+        for (_, _, year), expected, df in zip(self.tasks, serial, pooled):
+            pd.testing.assert_frame_equal(df, expected)
+            self.assertEqual(df["FiscalYear"].unique().tolist(), [year])
+
+    def test_no_tasks(self):
+        self.assertEqual(process_workbooks([]), [])
+        self.assertEqual(process_workbooks([], workers=2), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import pandas as pd
+
+from otld.append.combine_appended_files import consolidate_levels, format_state_index
+
+
+class TestFormatStateIndex(unittest.TestCase):
+    def test_format_state_index(self):
+        index = pd.MultiIndex.from_tuples(
+            [
+                ("U.S. TOTAL", 2015),
+                ("DIST. OF COLUMBIA", 2015),
+                ("NEW YORK", 2015),
+                ("U.S. TOTAL", 2016),
+            ],
+            names=["STATE", "year"],
+        )
+        self.assertEqual(
+            format_state_index(index).to_list(),
+            [
+                ("U.S. Total", 2015),
+                ("District of Columbia", 2015),
+                ("New York", 2015),
+                ("U.S. Total", 2016),
+            ],
+        )
+        self.assertEqual(format_state_index(index).names, ["State", "FiscalYear"])
+
+
+class TestConsolidateLevels(unittest.TestCase):
+    def test_consolidate_levels(self):
+        index = pd.MultiIndex.from_tuples(
+            [("ALABAMA", 2015), ("PUERTO RICO", 2015), ("NEW YORK", 2015)],
+            names=["STATE", "year"],
+        )
+        federal = pd.DataFrame({"1": [1, 2, 3], "6": [4, 5, 6]}, index=index)
+        state = pd.DataFrame({"6": [7, 8, 9]}, index=index)
+        frames = {
+            "Federal": federal,
+            "State": state,
+            "Total": federal.add(state, fill_value=0),
+        }
+        instructions = pd.DataFrame(
+            {"instructions": ["1,6", "6"], "name": ["All", "Six"]}
+        )
+        rename_dict = {"1": "1. One", "6": "6. Six"}
+
+        levels = consolidate_levels(frames, instructions, rename_dict)
+
+        # The lines State lacks are not kept and do not turn its totals to floats
+        self.assertEqual(list(levels["State"].columns), ["6. Six", "All", "Six"])
+        self.assertEqual(
+            list(levels["Federal"].columns), ["1. One", "6. Six", "All", "Six"]
+        )
+        for funding in ["Federal", "State"]:
+            self.assertTrue((levels[funding].dtypes == "int64").all())
+        self.assertEqual(levels["Total"]["Six"].dtype, "int64")
+        for df in levels.values():
+            self.assertEqual(df.index.names, ["State", "FiscalYear"])
+            self.assertNotIn("Puerto Rico", df.index.get_level_values("State"))
+
+        self.assertEqual(levels["State"]["All"].to_list(), [7, 9])
+        self.assertEqual(levels["Federal"]["All"].to_list(), [5, 9])
+        self.assertEqual(levels["Total"]["All"].to_list(), [12, 18])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from otld.utils import crosswalk_2014_2015
+
+
+class TestCrosswalk(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "Instruction Crosswalk.xlsx")
+        self.write({"196R": ["1", "2"], 196: ["5a", "6,7"], "name": ["A", "B"]})
+
+        self.patches = [
+            patch.object(crosswalk_2014_2015, "input_dir", self.temp_dir.name),
+            patch.object(
+                crosswalk_2014_2015,
+                "CACHE_DIR",
+                os.path.join(self.temp_dir.name, "cache"),
+            ),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+        self.reset()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.reset()
+        self.temp_dir.cleanup()
+
+    def write(self, data: dict):
+        pd.DataFrame(data).to_excel(self.path, sheet_name="crosswalk", index=False)
+
+    def reset(self):
+        crosswalk_2014_2015._crosswalk = None
+        crosswalk_2014_2015._crosswalk_dict = None
+        crosswalk_2014_2015._consolidated_categories = None
+
+    def test_lazy(self):
+        # Nothing is read until first use
+        self.assertIsNone(crosswalk_2014_2015._crosswalk)
+
+        crosswalk_dict = crosswalk_2014_2015.get_crosswalk_dict()
+        self.assertEqual(crosswalk_dict["1"][196], "5a")
+        self.assertEqual(crosswalk_dict["2"][196], ["6", "7"])
+        self.assertIs(crosswalk_2014_2015.crosswalk_dict, crosswalk_dict)
+        self.assertIs(crosswalk_2014_2015.crosswalk, crosswalk_2014_2015._crosswalk)
+
+    def test_cache(self):
+        crosswalk = crosswalk_2014_2015.get_crosswalk()
+
+        # A new run reuses the parsed crosswalk
+        self.reset()
+        with patch.object(pd, "read_excel", side_effect=AssertionError):
+            pd.testing.assert_frame_equal(
+                crosswalk_2014_2015.get_crosswalk(), crosswalk
+            )
+
+        # Changing the workbook invalidates the cache
+        self.reset()
+        self.write({"196R": ["1"], 196: [""], "name": ["C"]})
+        self.assertEqual(crosswalk_2014_2015.get_crosswalk_dict()["1"]["name"], "C")
+        self.assertEqual(crosswalk_2014_2015.get_crosswalk_dict()["1"][196], "")
+
+    def test_consolidated_categories(self):
+        with pd.ExcelWriter(self.path) as writer:
+            pd.DataFrame({"196R": ["1"]}).to_excel(writer, sheet_name="crosswalk")
+            pd.DataFrame({"instructions": [6, "7a,8a"], "name": ["A", "B"]}).to_excel(
+                writer, sheet_name="consolidated_categories", index=False
+            )
+
+        consolidated = crosswalk_2014_2015.get_consolidated_categories()
+        self.assertEqual(consolidated["instructions"].to_list(), ["6", "7a,8a"])
+
+        # Later calls, and new runs, do not read the workbook again
+        with patch.object(pd, "read_excel", side_effect=AssertionError):
+            self.assertIs(
+                crosswalk_2014_2015.get_consolidated_categories(), consolidated
+            )
+            self.reset()
+            pd.testing.assert_frame_equal(
+                crosswalk_2014_2015.get_consolidated_categories(), consolidated
+            )
+
+    def test_missing(self):
+        os.remove(self.path)
+        self.assertTrue(crosswalk_2014_2015.get_crosswalk().empty)
+        self.assertEqual(crosswalk_2014_2015.get_crosswalk_dict(), {})
+        self.assertTrue(crosswalk_2014_2015.get_consolidated_categories().empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otld.utils.financial_utils import (
+    consolidate_categories,
+    consolidation_matrix,
+    reindex_state_year,
+    state_year_order,
+)
+
+INSTRUCTIONS = pd.DataFrame(
+    {
+        "instructions": [6, "7a,8a", "11b", 23],
+        "name": ["Basic Assistance", "Child Welfare", "Head Start", "Other"],
+    }
+)
+
+
+class TestConsolidateCategories(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "6. Basic Assistance": [1, 2],
+                "7a. Foster Care": [10.0, np.nan],
+                "8a. Foster Care": [100.0, 200.0],
+                "11b. Head Start": [5, 6],
+                "16. Supportive Services": [7, 8],
+            }
+        )
+
+    def test_matrix(self):
+        pairs = tuple(zip(INSTRUCTIONS["instructions"], INSTRUCTIONS["name"]))
+        lines, matrix = consolidation_matrix(tuple(self.df.columns), pairs)
+        self.assertEqual(
+            lines,
+            [
+                "6. Basic Assistance",
+                "7a. Foster Care",
+                "8a. Foster Care",
+                "11b. Head Start",
+            ],
+        )
+        np.testing.assert_array_equal(
+            matrix, [[1, 0, 0, 0], [0, 1, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]]
+        )
+
+    def test_consolidate(self):
+        consolidate_categories(self.df, INSTRUCTIONS)
+
+        # Missing values are skipped, integer sums stay integers and categories
+        # without columns are 0
+        pd.testing.assert_frame_equal(
+            self.df[INSTRUCTIONS["name"]],
+            pd.DataFrame(
+                {
+                    "Basic Assistance": [1, 2],
+                    "Child Welfare": [110.0, 200.0],
+                    "Head Start": [5, 6],
+                    "Other": [0.0, 0.0],
+                }
+            ),
+        )
+
+
+class TestReindexStateYear(unittest.TestCase):
+    def test_order(self):
+        # U.S. totals move to the start of their funding and year block
+        index = pd.MultiIndex.from_tuples(
+            [
+                ("Total", 2023, "Alabama"),
+                ("Total", 2023, "U.S. Total"),
+                ("Total", 2022, "Alabama"),
+                ("Total", 2022, "U.S. Total"),
+                ("State", 2023, "Alabama"),
+                ("State", 2023, "U.S. Total"),
+            ],
+            names=["Funding", "FiscalYear", "State"],
+        )
+        np.testing.assert_array_equal(state_year_order(index), [1, 0, 3, 2, 5, 4])
+
+    def test_trailing_totals(self):
+        # Totals appended after every year are placed in their own year
+        df = pd.DataFrame(
+            {"value": range(6)},
+            index=pd.MultiIndex.from_tuples(
+                [
+                    ("ALABAMA", 1997),
+                    ("WYOMING", 1997),
+                    ("ALABAMA", 1998),
+                    ("WYOMING", 1998),
+                    ("U.S. TOTAL", 1997),
+                    ("U.S. TOTAL", 1998),
+                ],
+                names=["STATE", "year"],
+            ),
+        )
+        df = reindex_state_year(df, ["State", "FiscalYear"])
+        self.assertEqual(df["value"].to_list(), [4, 0, 1, 5, 2, 3])
+        self.assertEqual(df.index.names, ["State", "FiscalYear"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import importlib
+import subprocess
+import sys
+import unittest
+
+import otld.utils
+
+# Modules loaded by the entry points before a command runs
+ENTRY_POINTS = [
+    "otld.append.append",
+    "otld.append.gui",
+    "otld.tableau.TableauDatasets",
+    "otld.tableau.gui",
+]
+
+# Data dependencies that should only load when a command runs
+HEAVY = ["pandas", "numpy", "openpyxl", "pyarrow"]
+
+# Fraction of the time to import pandas that importing the entry points may take.
+# Both are measured in the same process, so the budget holds on slow runners.
+BUDGET = 1 / 3
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+class TestImportTime(unittest.TestCase):
+    def test_entry_points(self):
+        # Importing the entry points does not load the data stack
+        code = "; ".join(
+            [
+                "import sys",
+                *[f"import {module}" for module in ENTRY_POINTS],
+                f"print(sorted(set({HEAVY!r}) & set(sys.modules)))",
+            ]
+        )
+        result = run(code)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_budget(self):
+        # Importing the entry points takes a fraction of the time to import pandas
+        code = "; ".join(
+            [*[f"import {module}" for module in ENTRY_POINTS], "import pandas"]
+        )
+        result = run(code, "-X", "importtime")
+
+        # Lines of -X importtime are "import time: self [us] | cumulative | name"
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[1].strip().isdigit():
+                cumulative[fields[2].strip()] = int(fields[1])
+
+        otld = sum(cumulative[module] for module in ENTRY_POINTS)
+        pandas = cumulative["pandas"]
+        self.assertLess(otld, BUDGET * pandas, f"{otld} us, pandas {pandas} us")
+
+    def test_help(self):
+        # --help and argument errors are handled without loading the data stack
+        for module, main in [
+            ("otld.append.append", "main"),
+            ("otld.tableau.TableauDatasets", "main"),
+        ]:
+            code = "; ".join(
+                [
+                    "import sys",
+                    "sys.argv = ['otld', '--help']",
+                    f"from {module} import {main}",
+                    "exec('try:\\n    main()\\nexcept SystemExit:\\n    pass')",
+                    f"print(sorted(set({HEAVY!r}) & set(sys.modules)))",
+                ]
+            )
+            result = run(code)
+            self.assertIn("usage:", result.stdout)
+            self.assertTrue(result.stdout.strip().endswith("[]"), result.stdout)
+
+    def test_exports(self):
+        # The lazy re-exports of otld.utils match the __all__ of their modules
+        modules = {module for module in otld.utils._EXPORTS.values()}
+        for module in modules:
+            module = importlib.import_module(f"otld.utils.{module}")
+            for name in getattr(module, "__all__", []):
+                self.assertEqual(
+                    otld.utils._EXPORTS[name], module.__name__.split(".")[-1]
+                )
+
+        for name in otld.utils._EXPORTS:
+            self.assertIsNotNone(getattr(otld.utils, name))
+        self.assertTrue(callable(otld.utils.validate_data_frame))
+
+
+if __name__ == "__main__":
+    unittest.main()
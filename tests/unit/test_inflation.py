@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otld.utils.inflation import (
+    MONTHS,
+    fiscal_year_index,
+    inflation_adjust,
+    read_deflator,
+)
+
+
+class TestInflation(unittest.TestCase):
+    def setUp(self):
+        # Each month's value is its position in the series, starting in 2020
+        self.df = pd.DataFrame(
+            np.arange(36, dtype=float).reshape(3, 12),
+            index=pd.Index([2020, 2021, 2022], name="Year"),
+            columns=MONTHS,
+        )
+
+    def test_read_deflator(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "pce.csv")
+            # Columns in the order written by clean_pce
+            self.df[sorted(MONTHS)].rename_axis("year").to_csv(path)
+            df = read_deflator(path)
+
+        self.assertEqual(df.index.name, "Year")
+        pd.testing.assert_frame_equal(
+            df[MONTHS], self.df, check_names=False, check_index_type=False
+        )
+
+    def test_fiscal_year_index(self):
+        index = fiscal_year_index(self.df)
+
+        # 2020 has no preceding October-December
+        self.assertTrue(np.isnan(index.loc[2020]))
+        # October 2020 (9) through September 2021 (20)
+        self.assertEqual(index.loc[2021], np.mean(range(9, 21)))
+        self.assertEqual(index.loc[2022], np.mean(range(21, 33)))
+
+        # Fiscal years spanning a missing month or year are missing
+        self.df.loc[2021, "Nov"] = np.nan
+        index = fiscal_year_index(self.df)
+        self.assertEqual(index.loc[2021], np.mean(range(9, 21)))
+        self.assertTrue(np.isnan(index.loc[2022]))
+        index = fiscal_year_index(self.df.drop(2021))
+        self.assertEqual(index.index.tolist(), [2020, 2021, 2022])
+        self.assertTrue(index.isna().all())
+
+    def test_inflation_adjust(self):
+        index = pd.Series([50.0, 100.0], index=[2021, 2022])
+        year = pd.Series([2021, 2022, 2021], dtype=np.int16)
+        amount = pd.Series([10, 10, 20])
+
+        adjusted = inflation_adjust(amount, year, index, 2022)
+        self.assertEqual(adjusted.tolist(), [20.0, 10.0, 40.0])
+        self.assertEqual(inflation_adjust(amount, year, index, 2021)[1], 5.0)
+
+        # Base years missing from the index, or missing months, are errors
+        for base_year, index in [(2023, index), (2022, index.replace(100.0, np.nan))]:
+            with self.assertRaisesRegex(ValueError, str(base_year)):
+                inflation_adjust(amount, year, index, base_year)
+
+
+if __name__ == "__main__":
+    unittest.main()
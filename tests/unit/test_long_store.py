@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from otld.utils.long_store import read_long_store, write_long_store
+from otld.utils.schema import apply_long_schema
+
+
+class TestLongStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "FinancialDataLong.parquet")
+
+        index = pd.MultiIndex.from_product(
+            [["Alabama", "Alaska", "U.S. Total"], [2021, 2022, 2023]],
+            names=["State", "FiscalYear"],
+        )
+        frames = []
+        for i, funding in enumerate(["Federal", "State", "Total"]):
+            df = pd.DataFrame(
+                {"1. Awarded": range(9), "2. Transfers": range(100, 109)},
+                index=index,
+            )
+            df = df.melt(var_name="Category", value_name="Amount", ignore_index=False)
+            df["Amount"] += i * 1000
+            df["Funding"] = funding
+            frames.append(df)
+        self.df = pd.concat(frames)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        write_long_store(self.df, self.path)
+        self.assertTrue(os.path.isdir(os.path.join(self.path, "Funding=Federal")))
+
+        df = read_long_store(self.path)
+        self.assertEqual(
+            df.columns.tolist(),
+            ["State", "FiscalYear", "Category", "Amount", "Funding"],
+        )
+
+        sort = ["Funding", "State", "FiscalYear", "Category"]
+        expected = apply_long_schema(self.df.reset_index()).sort_values(
+            sort, ignore_index=True
+        )
+        pd.testing.assert_frame_equal(df.sort_values(sort, ignore_index=True), expected)
+
+        # Writing again replaces the store rather than adding to it
+        write_long_store(self.df, self.path)
+        self.assertEqual(read_long_store(self.path).shape, df.shape)
+
+    def test_filters(self):
+        write_long_store(self.df, self.path)
+
+        df = read_long_store(
+            self.path,
+            states=["Alaska"],
+            years=(2022, 2023),
+            funding=["State"],
+            categories=["2. Transfers"],
+        )
+        self.assertEqual(df.shape[0], 2)
+        self.assertEqual(set(df["State"]), {"Alaska"})
+        self.assertEqual(sorted(df["FiscalYear"]), [2022, 2023])
+        self.assertEqual(set(df["Funding"]), {"State"})
+        self.assertEqual(sorted(df["Amount"]), [1104, 1105])
+
+        df = read_long_store(self.path, funding=["Total"], columns=["State", "Amount"])
+        self.assertEqual(df.columns.tolist(), ["State", "Amount"])
+        self.assertEqual(df.shape[0], 18)
+
+
+if __name__ == "__main__":
+    unittest.main()
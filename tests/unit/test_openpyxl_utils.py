@@ -2,8 +2,11 @@ import os
 import tempfile
 import unittest
 from unittest import TestCase
+from unittest.mock import patch
 
+import openpyxl
 import pandas as pd
+import xlsxwriter
 
 from otld.utils import openpyxl_utils
 from otld.utils.MockData import MockData
@@ -63,6 +66,125 @@ class TestExportWorkbook(TestCase):
 
         footnotes.close()
 
+    def test_streaming(self):
+        # Export the same frames with both engines, streaming rows in several chunks
+        paths = [os.path.join(TEMP_DIR.name, f"test_{i}.xlsx") for i in range(2)]
+        footnotes = {key: [["A note"]] for key in mock_data.frames}
+        for path, streaming in zip(paths, [False, True]):
+            with patch.object(openpyxl_utils, "CHUNK_ROWS", 7):
+                openpyxl_utils.export_workbook(
+                    mock_data.frames,
+                    path,
+                    format_options={"skip_cols": 1},
+                    footnotes=footnotes,
+                    streaming=streaming,
+                )
+
+        # Confirm that the layout of the workbooks matches
+        default, streamed = [openpyxl.load_workbook(path) for path in paths]
+        self.assertEqual(default.sheetnames, streamed.sheetnames)
+        for sheet in default.sheetnames:
+            expected, actual = default[sheet], streamed[sheet]
+            self.assertEqual(expected.dimensions, actual.dimensions)
+            self.assertEqual(
+                [(table.ref, table.column_names) for table in expected.tables.values()],
+                [(table.ref, table.column_names) for table in actual.tables.values()],
+            )
+            for expected_row, actual_row in zip(expected.rows, actual.rows):
+                for expected_cell, actual_cell in zip(expected_row, actual_row):
+                    self.assertEqual(expected_cell.value or "", actual_cell.value or "")
+                    self.assertEqual(
+                        expected_cell.number_format, actual_cell.number_format
+                    )
+                    self.assertEqual(
+                        expected_cell.alignment.horizontal,
+                        actual_cell.alignment.horizontal,
+                    )
+
+
+class TestMergedCells(TestCase):
+    def setUp(self):
+        # Title row, then a two-row header with merged group labels
+        workbook = openpyxl.Workbook()
+        self.worksheet = workbook.active
+        self.worksheet.append(["Title"])
+        self.worksheet.append(["STATE", "Group", None, None])
+        self.worksheet.append([None, "A", "B", "Total"])
+        self.worksheet.merge_cells("B2:C2")
+        self.worksheet.merge_cells("A2:A3")
+
+    def test_get_merged_value(self):
+        merged = openpyxl_utils.merged_cell_index(self.worksheet)
+        self.assertEqual(merged[(2, 3)], "Group")
+        self.assertEqual(merged[(3, 1)], "STATE")
+        self.assertNotIn((3, 2), merged)
+
+        for cell, expected in [("C2", "Group"), ("A3", "STATE"), ("B3", "A")]:
+            cell = self.worksheet[cell]
+            self.assertEqual(
+                openpyxl_utils.get_merged_value(self.worksheet, cell), expected
+            )
+            self.assertEqual(
+                openpyxl_utils.get_merged_value(self.worksheet, cell, merged), expected
+            )
+
+    def test_get_column_names(self):
+        columns, i = openpyxl_utils.get_column_names(self.worksheet)
+        self.assertEqual(columns, ["STATE STATE", "Group A", "Group B", "Total"])
+        self.assertEqual(i, 3)
+
+    def test_non_empty_columns(self):
+        # Empty columns between and after the data are skipped
+        self.worksheet["F3"].value = "Other"
+        self.worksheet.append(["Alabama", 1, 2, 3, None, 4])
+        self.worksheet.cell(1, 8)
+        usecols = openpyxl_utils.get_non_empty_columns(self.worksheet)
+        self.assertEqual(usecols, [0, 1, 2, 3, 5])
+        self.assertEqual(self.worksheet.max_column, 8)
+
+        columns, i = openpyxl_utils.get_column_names(self.worksheet, usecols)
+        self.assertEqual(
+            columns, ["STATE STATE", "Group A", "Group B", "Total", "Other"]
+        )
+
+        # The mask can be handed to pandas along with the loaded workbook
+        df = pd.read_excel(
+            self.worksheet.parent,
+            sheet_name=self.worksheet.title,
+            skiprows=i,
+            header=None,
+            usecols=usecols,
+            engine="openpyxl",
+        )
+        self.assertEqual(df.values.tolist(), [["Alabama", 1, 2, 3, 4]])
+
+    def test_non_empty_columns_formulas(self):
+        # A column holding only a formula is kept, and read as its cached value
+        path = os.path.join(TEMP_DIR.name, "test_formulas.xlsx")
+        workbook = xlsxwriter.Workbook(path)
+        worksheet = workbook.add_worksheet("Federal")
+        worksheet.write_row(0, 0, ["Title"])
+        worksheet.write_row(1, 0, ["STATE", "A", None, "Total"])
+        worksheet.write_row(2, 0, ["Alabama", 1])
+        worksheet.write_formula(2, 3, "=B3*2", None, 2)
+        workbook.close()
+
+        worksheet = openpyxl.load_workbook(path, data_only=True)["Federal"]
+        usecols = openpyxl_utils.get_non_empty_columns(worksheet)
+        self.assertEqual(usecols, [0, 1, 3])
+
+        columns, i = openpyxl_utils.get_column_names(worksheet, usecols)
+        df = pd.read_excel(
+            worksheet.parent,
+            sheet_name=worksheet.title,
+            skiprows=i,
+            header=None,
+            usecols=usecols,
+            engine="openpyxl",
+        )
+        self.assertEqual(columns, ["STATE", "A", "Total"])
+        self.assertEqual(df.values.tolist(), [["Alabama", 1, 2]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -41,6 +41,19 @@ class TestPandasUtils(unittest.TestCase):
         self.assertEqual(columns, ["Line 1 Name", "Line 2 Name", "State"])
         self.assertEqual(df.iloc[0].tolist(), [1, 2, 3])
 
+    def test_convert_to_numeric(self):
+        series = pd.Series(["1,000", "(2,500)", "<3>", "-", " 4 ", 5.5, 6])
+        converted = putils.convert_to_numeric(series)
+        self.assertEqual(converted.dtype, "int64")
+        self.assertEqual(converted.tolist(), [1000, -2500, -3, 0, 4, 6, 6])
+
+        # Columns with missing values remain floats
+        df = pd.DataFrame({"a": ["1", None], "b": ["(1)", 2]})
+        converted = putils.convert_to_numeric(df)
+        self.assertEqual(converted["a"].dtype, "float64")
+        self.assertEqual(converted["b"].tolist(), [-1, 2])
+        pd.testing.assert_frame_equal(converted, df.apply(putils.convert_to_numeric))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otld.utils.reshape_utils import wide_to_long
+
+
+def melt_and_concat(frames: dict, value_vars: list[str] = None) -> pd.DataFrame:
+    long = []
+    for key, df in frames.items():
+        df = df.melt(
+            value_vars=value_vars,
+            var_name="Category",
+            value_name="Amount",
+            ignore_index=False,
+        )
+        df["Funding"] = key
+        long.append(df)
+
+    return pd.concat(long)
+
+
+class TestWideToLong(unittest.TestCase):
+    def setUp(self):
+        def index(states, years):
+            return pd.MultiIndex.from_arrays(
+                [states, years], names=["State", "FiscalYear"]
+            )
+
+        self.frames = {
+            "Total": pd.DataFrame(
+                {"A": [1, 2, 3], "B": [4.5, 5.0, np.nan]},
+                index=index(["Ohio", "Iowa", np.nan], [2020, 2021, 2020]),
+            ),
+            "Federal": pd.DataFrame(
+                {"B": [1, 2], "A": [7, 8]},
+                index=index(["Utah", "Ohio"], [2022, 2020]),
+            ),
+        }
+
+    def test_matches_melt(self):
+        for value_vars in [None, ["B"]]:
+            expected = melt_and_concat(self.frames, value_vars)
+            actual = wide_to_long(self.frames, "Amount", value_vars)
+
+            # Categories and keys are categoricals, with the same values as melt
+            self.assertIsInstance(actual["Category"].dtype, pd.CategoricalDtype)
+            self.assertEqual(list(actual["Funding"].cat.categories), list(self.frames))
+            pd.testing.assert_frame_equal(
+                actual.astype({"Category": object, "Funding": object}), expected
+            )
+
+    def test_flat_index(self):
+        frames = {
+            "TANF": pd.DataFrame({"A": [1, 2]}, index=pd.Index(["Ohio", "Iowa"])),
+            "SSP_MOE": pd.DataFrame({"A": [3]}, index=pd.Index(["Utah"])),
+        }
+        expected = melt_and_concat(frames)
+        actual = wide_to_long(frames, "Amount")
+        pd.testing.assert_index_equal(actual.index, expected.index)
+
+    def test_consume(self):
+        expected = melt_and_concat(self.frames)
+        frames = dict(self.frames)
+        actual = wide_to_long(frames, "Amount", consume=True)
+        self.assertEqual(frames, {})
+        pd.testing.assert_frame_equal(
+            actual.astype({"Category": object, "Funding": object}), expected
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
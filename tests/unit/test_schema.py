@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otld.utils.schema import (
+    apply_long_schema,
+    downcast_integer,
+    map_categories,
+    to_categorical,
+)
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "State": ["Alabama", "Alaska", "U.S. Total"],
+                "FiscalYear": [2021.0, 2022.0, 2023.0],
+                "Funding": ["Federal", "State", "Total"],
+                "Category": ["1. Awarded", "1. Awarded", "Not a category"],
+                "Amount": [1, 2, 3],
+                "Other": ["a", "b", "c"],
+            }
+        )
+
+    def test_apply_long_schema(self):
+        df = apply_long_schema(self.df)
+
+        for column in ["State", "Funding", "Category"]:
+            self.assertIsInstance(df[column].dtype, pd.CategoricalDtype)
+            self.assertEqual(df[column].tolist(), self.df[column].tolist())
+        self.assertEqual(df["Other"].dtype, object)
+        self.assertEqual(df["FiscalYear"].dtype, np.int16)
+
+        # Amounts keep 64-bit types, so arithmetic on them does not overflow
+        self.assertEqual(df["Amount"].dtype, np.int64)
+        df = apply_long_schema(self.df.astype({"Amount": float}))
+        self.assertEqual(df["Amount"].dtype, np.float64)
+
+        # Values outside of the vocabulary are kept as extra categories
+        self.assertEqual(df["Category"].cat.categories[-1], "Not a category")
+
+        # The input is not modified
+        self.assertEqual(self.df["State"].dtype, object)
+
+        # Frames sharing the schema concatenate without losing the categoricals
+        df = pd.concat([df, apply_long_schema(self.df.head(1))])
+        self.assertIsInstance(df["State"].dtype, pd.CategoricalDtype)
+
+    def test_to_categorical(self):
+        series = pd.Series(["b", None, "a", "c"])
+        result = to_categorical(series, ["a", "b"])
+        self.assertEqual(result.cat.categories.tolist(), ["a", "b", "c"])
+        self.assertTrue(result.isna().iloc[1])
+
+        # Categoricals with the same categories in another order are recoded
+        result = to_categorical(series.astype("category"), ["c", "b", "a"])
+        self.assertEqual(result.cat.categories.tolist(), ["c", "b", "a"])
+        self.assertEqual(result.tolist()[2:], ["a", "c"])
+
+    def test_map_categories(self):
+        series = pd.Series(["6. Basic", "7a. Care", "8a. Care", None, "99. New"])
+        result = map_categories(series, {"7a. Care": "Welfare", "8a. Care": "Welfare"})
+        self.assertIsInstance(result.dtype, pd.CategoricalDtype)
+        self.assertEqual(result.cat.categories.tolist(), ["Welfare"])
+        self.assertEqual(result.isna().tolist(), [True, False, False, True, True])
+
+        result = map_categories(series, lambda x: x.split(".")[0])
+        self.assertEqual(result.tolist()[:3], ["6", "7a", "8a"])
+
+    def test_downcast_integer(self):
+        self.assertEqual(downcast_integer(pd.Series([1.0, 200.0])).dtype, np.int16)
+
+        for values in [[1.5, 2.0], [1.0, np.nan]]:
+            series = pd.Series(values)
+            self.assertIs(downcast_integer(series), series)
+
+        series = pd.Series(["1", "2"])
+        self.assertIs(downcast_integer(series), series)
+
+
+if __name__ == "__main__":
+    unittest.main()
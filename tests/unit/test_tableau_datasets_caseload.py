@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otld.tableau.tableau_datasets_caseload import transform_caseload_long
+
+
+class TestTransformCaseloadLong(unittest.TestCase):
+    def test_transform(self):
+        df = pd.DataFrame(
+            {
+                "State": ["Alabama"] * 6,
+                "FiscalYear": [2022, 2022, 2022, 2023, 2023, 2023],
+                "Category": [
+                    "Total Families",
+                    "One Parent Families",
+                    "Total Recipients",
+                ]
+                * 2,
+                "Number": [100.0, 25.0, 0.0, 200.0, 100.0, 10.0],
+                "Funding": ["TANF"] * 6,
+            }
+        ).astype({"Category": "category", "State": "category"})
+
+        out = transform_caseload_long(df)
+        np.testing.assert_allclose(
+            out["log_value"], [2, np.log10(25), np.nan, np.log10(200), 2, 1]
+        )
+
+        # Shares of the family or recipient total of the same year
+        self.assertEqual(out["pct_of_total"].to_list(), [100, 25, 0, 100, 50, 100])
+
+        # Deviation from the first year, with 0 where the base is 0
+        self.assertEqual(out["pct_deviation"].to_list(), [100, 100, 0, 200, 400, 0])
+        self.assertNotIn("log_value", df.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otld.utils.validate_data_frame import ValidationResult, validate_data_frame
+
+
+class TestValidateDataFrame(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {"Amount": [1.0, 2.0, 3.0], "Families": [1, 2, 3]},
+            index=pd.MultiIndex.from_tuples(
+                [("U.S. Total", 2023), ("Alabama", 2023), ("Wyoming", 2023)],
+                names=["State", "FiscalYear"],
+            ),
+        )
+
+    def test_valid(self):
+        result = validate_data_frame(self.df)
+        self.assertIsInstance(result, ValidationResult)
+        self.assertTrue(result.valid)
+
+    def test_violations(self):
+        df = self.df.copy()
+        df["Notes"] = "text"
+        df.index = pd.MultiIndex.from_tuples(
+            [("Alabama", 2023), ("Alabama", 2023), ("Atlantis", 2023)],
+            names=["State", "FiscalYear"],
+        )
+
+        # Every violation is reported, not only the first
+        result = validate_data_frame(df, raise_errors=False)
+        self.assertEqual(
+            result.violations,
+            {
+                "numeric": ["Notes"],
+                "duplicated_index": [("Alabama", 2023)],
+                "states": [("Atlantis", 2023)],
+            },
+        )
+        with self.assertRaisesRegex(AssertionError, "(?s)not numeric.*invalid"):
+            validate_data_frame(df)
+
+    def test_states(self):
+        # Missing states in an index level, a flat index and a column are invalid
+        df = self.df.rename(index={"Wyoming": np.nan}, level="State")
+        self.assertEqual(
+            validate_data_frame(df, raise_errors=False).violations["states"],
+            [(np.nan, 2023)],
+        )
+
+        df = self.df.reset_index("FiscalYear")
+        df.index = ["Alabama", "Guam", "Narnia"]
+        df.index.name = "State"
+        result = validate_data_frame(df.drop(columns="FiscalYear"), False)
+        self.assertEqual(result.violations, {"states": ["Narnia"]})
+
+        df = pd.DataFrame({"State": ["Ohio", "Oz"], "Amount": [1, 2]})
+        result = validate_data_frame(df, raise_errors=False)
+        self.assertEqual(result.violations, {"numeric": ["State"], "states": ["Oz"]})
+
+
+if __name__ == "__main__":
+    unittest.main()